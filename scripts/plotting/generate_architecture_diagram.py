@@ -12,12 +12,17 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.diagram_gen.generator import (
+    generate_all,
     generate_detailed_diagram,
     generate_main_diagram,
     generate_network_flow_diagram,
 )
 from src.diagram_gen.generator import LabLinkDiagramBuilder
-from src.terraform_parser.parser import parse_directory, parse_lablink_architecture
+from src.terraform_parser.parser import (
+    parse_directory,
+    parse_directory_cached,
+    parse_lablink_architecture,
+)
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -127,6 +132,19 @@ Examples:
         help="Disable timestamped run folders"
     )
 
+    parser.add_argument(
+        "--parse-cache",
+        action="store_true",
+        help="Reuse parsed Terraform from the on-disk parse cache (default: off)"
+    )
+
+    parser.add_argument(
+        "--no-diagram-cache",
+        action="store_false",
+        dest="diagram_cache",
+        help="Always re-render core diagrams instead of reusing cached renders"
+    )
+
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Enable verbose logging"
     )
@@ -179,7 +197,8 @@ def main():
             else:
                 # Single-tier parsing: infrastructure only
                 logger.info(f"Parsing Terraform files from: {args.terraform_dir}")
-                config = parse_directory(args.terraform_dir)
+                parse = parse_directory_cached if args.parse_cache else parse_directory
+                config = parse(args.terraform_dir)
                 logger.info(f"Parsed {len(config.get_all_resources())} resources")
 
             logger.debug(f"  - EC2 instances: {len(config.ec2_instances)}")
@@ -239,7 +258,40 @@ def main():
     # Create builder for new diagram types (pass None for database-schema which doesn't need config)
     builder = LabLinkDiagramBuilder(config) if config is not None else LabLinkDiagramBuilder(None)
 
-    for diagram_type in diagram_types:
+    # The three Terraform-driven diagrams are independent, so when all of them
+    # are requested render them in parallel worker processes
+    core_types = ["main", "detailed", "network-flow"]
+    remaining_types = diagram_types
+    if all(diagram_type in diagram_types for diagram_type in core_types):
+        remaining_types = [t for t in diagram_types if t not in core_types]
+        for fmt in formats:
+            try:
+                logger.info(
+                    f"Generating main, detailed and network flow diagrams in parallel ({fmt})..."
+                )
+                expected_files = generate_all(
+                    config,
+                    run_dir,
+                    format=fmt,
+                    dpi=args.dpi,
+                    fontsize_preset=args.fontsize_preset,
+                    use_cache=args.diagram_cache,
+                )
+                for expected_file in expected_files:
+                    if expected_file.exists():
+                        logger.info(f"  ✓ Created: {expected_file}")
+                        success_count += 1
+                    else:
+                        logger.warning(f"  ✗ Expected file not found: {expected_file}")
+
+            except Exception as e:
+                logger.error(f"Failed to generate core diagrams in {fmt}: {e}")
+                if args.verbose:
+                    import traceback
+
+                    traceback.print_exc()
+
+    for diagram_type in remaining_types:
         for fmt in formats:
             try:
                 if diagram_type == "main":
@@ -247,20 +299,28 @@ def main():
                     logger.info(
                         f"Generating main architecture diagram ({fmt})..."
                     )
-                    generate_main_diagram(config, output_path, format=fmt, dpi=args.dpi, fontsize_preset=args.fontsize_preset)
+                    generate_main_diagram(config, output_path, format=fmt, dpi=args.dpi, fontsize_preset=args.fontsize_preset, use_cache=args.diagram_cache)
 
                 elif diagram_type == "detailed":
                     output_path = run_dir / "lablink-architecture-detailed"
                     logger.info(f"Generating detailed diagram ({fmt})...")
                     generate_detailed_diagram(
-                        config, output_path, format=fmt, dpi=args.dpi
+                        config,
+                        output_path,
+                        format=fmt,
+                        dpi=args.dpi,
+                        use_cache=args.diagram_cache,
                     )
 
                 elif diagram_type == "network-flow":
                     output_path = run_dir / "lablink-network-flow"
                     logger.info(f"Generating network flow diagram ({fmt})...")
                     generate_network_flow_diagram(
-                        config, output_path, format=fmt, dpi=args.dpi
+                        config,
+                        output_path,
+                        format=fmt,
+                        dpi=args.dpi,
+                        use_cache=args.diagram_cache,
                     )
 
                 elif diagram_type == "vm-provisioning":
@@ -53,17 +53,16 @@ def generate_pdf_from_png(png_path: Path, pdf_path: Path):
         png_path: Path to the PNG file
         pdf_path: Path to save the PDF file
     """
-    # Read the PNG image
-    img = Image.open(png_path)
-
-    # Create a figure with the exact size of the image
-    dpi = 300  # High DPI for poster quality
-    fig_width = img.size[0] / dpi
-    fig_height = img.size[1] / dpi
-
-    fig, ax = plt.subplots(figsize=(fig_width, fig_height), dpi=dpi)
-    ax.imshow(img, cmap='gray')
-    ax.axis('off')
+    # Read the PNG image; we wrote it ourselves, so only probe the PNG decoder
+    with Image.open(png_path, formats=["PNG"]) as img:
+        # Create a figure with the exact size of the image
+        dpi = 300  # High DPI for poster quality
+        fig_width = img.size[0] / dpi
+        fig_height = img.size[1] / dpi
+
+        fig, ax = plt.subplots(figsize=(fig_width, fig_height), dpi=dpi)
+        ax.imshow(img, cmap='gray')
+        ax.axis('off')
 
     # Remove all margins and padding
     plt.subplots_adjust(left=0, right=1, top=1, bottom=0, wspace=0, hspace=0)
@@ -92,11 +92,13 @@ class DeploymentImpactPlotter:
         y_positions = np.arange(len(self.data))
 
         # Plot bars colored by audience type
-        for idx, row in self.data.iterrows():
-            color = AUDIENCE_COLORS.get(row['audience_type'], '#7f7f7f')
+        # itertuples yields plain namedtuples instead of building a Series per row
+        for row in self.data.itertuples():
+            idx = row.Index
+            color = AUDIENCE_COLORS.get(row.audience_type, '#7f7f7f')
             ax.barh(
                 idx,
-                row['participants'],
+                row.participants,
                 color=color,
                 alpha=0.8,
                 edgecolor='white',
@@ -104,11 +106,11 @@ class DeploymentImpactPlotter:
             )
 
             # Add participant count inside bar if space allows, otherwise outside
-            if row['participants'] > 30:
+            if row.participants > 30:
                 ax.text(
-                    row['participants'] / 2,
+                    row.participants / 2,
                     idx,
-                    f"{int(row['participants'])}",
+                    f"{int(row.participants)}",
                     ha='center',
                     va='center',
                     fontweight='bold',
@@ -117,9 +119,9 @@ class DeploymentImpactPlotter:
                 )
             else:
                 ax.text(
-                    row['participants'] + 5,
+                    row.participants + 5,
                     idx,
-                    f"{int(row['participants'])}",
+                    f"{int(row.participants)}",
                     ha='left',
                     va='center',
                     fontweight='bold',
@@ -128,10 +130,10 @@ class DeploymentImpactPlotter:
 
         # Set y-axis labels (workshop names + dates)
         labels = []
-        for _, row in self.data.iterrows():
-            date_str = row['date'].strftime('%b %Y')
+        for row in self.data.itertuples(index=False):
+            date_str = row.date.strftime('%b %Y')
             # Truncate long event names for readability
-            event_name = row['event_name']
+            event_name = row.event_name
             if len(event_name) > 45:
                 event_name = event_name[:42] + '...'
             labels.append(f"{date_str}: {event_name}")
@@ -2,6 +2,7 @@
 
 from .generator import (
     LabLinkDiagramBuilder,
+    generate_all,
     generate_detailed_diagram,
     generate_main_diagram,
     generate_network_flow_diagram,
@@ -12,4 +13,5 @@ __all__ = [
     "generate_main_diagram",
     "generate_detailed_diagram",
     "generate_network_flow_diagram",
+    "generate_all",
 ]
\ No newline at end of file
@@ -1,17 +1,41 @@
 """Generate architecture diagrams from parsed Terraform resources."""
 
+import dataclasses
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import cached_property, lru_cache
 from pathlib import Path
-
-from diagrams import Cluster, Diagram, Edge
-from diagrams.aws.compute import EC2, Lambda
-from diagrams.aws.management import CloudwatchLogs
-from diagrams.aws.network import ALB, ELB, Route53
-from diagrams.aws.security import IAMRole
-from diagrams.custom import Custom
-from diagrams.onprem.client import User, Users
+from types import MappingProxyType
 
 from src.terraform_parser.parser import ParsedTerraformConfig
 
+try:
+    import cairosvg
+except ImportError:
+    # PNGs fall back to Graphviz's own rasterizer
+    cairosvg = None
+
+# Rendered diagrams are cached here when callers opt in, keyed by a hash of the
+# parsed config, the builder options, this module's source and the renderer
+# versions (so code edits and tool upgrades invalidate it)
+DIAGRAM_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "lablink-diagrams"
+)
+_SOURCE_DIGEST = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=8).hexdigest()
+
+# One worker per core diagram rendered by generate_all
+_GENERATE_ALL_WORKERS = 3
+
+# Shortens Terraform conditions for node labels in a single pass
+_COND_SUB = re.compile(r"local\.|&&")
+_COND_MAP = {"local.": "", "&&": "&"}
+
 
 class LabLinkDiagramBuilder:
     """Builder class for creating LabLink architecture diagrams."""
@@ -23,12 +47,44 @@ class LabLinkDiagramBuilder:
         "presentation": {"title": 40, "node": 16, "edge": 16},  # Future use
     }
 
+    # Terraform resource names, in order of preference, for the nodes the
+    # detailed diagram routes its main request flow through
+    PREFERRED_NODE_NAMES = {
+        "ec2": ("lablink_allocator_server", "allocator_server"),
+        "r53": ("lablink_alb_record", "lablink_a_record", "allocator_dns"),
+    }
+
+    # DOT source of diagrams that do not depend on the parsed config, keyed by
+    # (diagram, render options). Later builds re-render it without rebuilding.
+    _DOT_SOURCE_CACHE: dict[tuple, str] = {}
+
+    # Node styles by resource kind; read-only so they can be shared across calls
+    _STYLE_DEFAULT = MappingProxyType({"style": "solid"})
+    _STYLE_CONDITIONAL = MappingProxyType(
+        {"style": "dashed", "color": "#28a745", "penwidth": "2.0"}  # Green border
+    )
+    _STYLE_RUNTIME = MappingProxyType(
+        {"style": "dotted", "color": "#fd7e14", "penwidth": "2.0"}  # Orange border
+    )
+
+    # Above this many parsed nodes the detailed diagram switches from dot's
+    # layered layout to sfdp, which scales near-linearly with graph size
+    LARGE_LAYOUT_NODE_THRESHOLD = 150
+
+    # Resolution for draft renders, which are always written as SVG
+    DRAFT_DPI = 100
+
+    # When a config exceeds the builder's node budget, each resource type is
+    # cut down to this many nodes plus a single "+K more" summary node
+    SUMMARY_NODES_PER_TYPE = 20
+
     def __init__(
         self,
         config: ParsedTerraformConfig,
         client_config: ParsedTerraformConfig | None = None,
         show_iam: bool = True,
         show_security_groups: bool = True,
+        max_nodes: int = 200,
     ):
         """
         Initialize diagram builder.
@@ -38,39 +94,48 @@ class LabLinkDiagramBuilder:
             client_config: Optional parsed client VM Terraform configuration
             show_iam: Whether to show IAM roles in diagram
             show_security_groups: Whether to show security groups in diagram
+            max_nodes: Parsed node budget; larger configs are summarized per
+                resource type instead of rendered in full
         """
         self.config = config
         self.client_config = client_config
         self.show_iam = show_iam
         self.show_security_groups = show_security_groups
+        self.max_nodes = max_nodes
+
+    @classmethod
+    def _output_settings(cls, format: str, dpi: int, draft: bool) -> tuple[str, int]:
+        """Return the (format, dpi) to render with, applying the draft override.
+
+        Args:
+            format: Requested output format
+            dpi: Requested DPI
+            draft: Whether a quick low-DPI SVG preview was requested
+
+        Returns:
+            tuple: ``("svg", DRAFT_DPI)`` for drafts, else ``(format, dpi)``
+        """
+        if draft:
+            return "svg", cls.DRAFT_DPI
+        return format, dpi
 
     def _get_node_style(self, resource):
         """
         Get visual styling for a node based on resource properties.
 
         Returns:
-            dict: Node styling attributes
+            Mapping: Read-only node styling attributes
         """
-        # Default style (always-present infrastructure)
-        style = {"style": "solid"}
-
         # Conditional resources: dashed border, green fill
         if resource.is_conditional:
-            style.update({
-                "style": "dashed",
-                "color": "#28a745",  # Green border
-                "penwidth": "2.0"
-            })
+            return self._STYLE_CONDITIONAL
 
         # Runtime-provisioned resources: dotted border, orange fill
-        elif resource.tier == "client_vm":
-            style.update({
-                "style": "dotted",
-                "color": "#fd7e14",  # Orange border
-                "penwidth": "2.0"
-            })
+        if resource.tier == "client_vm":
+            return self._STYLE_RUNTIME
 
-        return style
+        # Default style (always-present infrastructure)
+        return self._STYLE_DEFAULT
 
     def _format_label_with_annotation(self, base_label: str, resource):
         """
@@ -83,11 +148,25 @@ class LabLinkDiagramBuilder:
         Returns:
             str: Formatted label with annotations
         """
-        if resource.is_conditional and resource.condition:
+        return self._format_label_cached(
+            base_label, resource.is_conditional, resource.condition, resource.tier
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _format_label_cached(
+        base_label: str, is_conditional: bool, condition: str | None, tier: str
+    ) -> str:
+        """Format an annotated label from hashable resource properties.
+
+        Builders for the main, detailed and network flow diagrams format the
+        same labels, so results are shared across instances.
+        """
+        if is_conditional and condition:
             # Clean up condition for display
-            condition = resource.condition.replace("local.", "").replace("&&", "&")
+            condition = _COND_SUB.sub(lambda m: _COND_MAP[m.group(0)], condition)
             return f"{base_label}\n(When {condition})"
-        elif resource.tier == "client_vm":
+        elif tier == "client_vm":
             return f"{base_label}\n(Runtime-provisioned)"
         return base_label
 
@@ -177,74 +256,240 @@ class LabLinkDiagramBuilder:
         # The spacing needs to come from node height, which diagrams library controls
         return label
 
-    def _create_compute_components(self, cluster=None):
-        """Create compute resource components (EC2, Lambda)."""
-        components = {}
+    @cached_property
+    def _parsed_node_count(self) -> int:
+        """Number of parsed resources rendered as nodes in the detailed diagram."""
+        return self._count_spec_nodes(self._specs)
+
+    def _count_spec_nodes(self, specs: dict[str, list[tuple]]) -> int:
+        """Count the nodes a set of per-type node specs would render."""
+        return sum(
+            len(type_specs)
+            for resource_type, type_specs in specs.items()
+            if resource_type != "iam" or self.show_iam
+        )
+
+    def _summarize_if_large(self, specs: list[tuple]) -> list[tuple]:
+        """Keep the first few specs of a type and fold the rest into one node.
+
+        Args:
+            specs: (resource name, node class, node label) specs for one type
+
+        Returns:
+            list: ``specs`` unchanged if short enough, otherwise the first
+            ``SUMMARY_NODES_PER_TYPE`` specs plus a "+K more" summary spec
+        """
+        keep = self.SUMMARY_NODES_PER_TYPE
+        if len(specs) <= keep:
+            return specs
+        node_cls = specs[0][1]
+        return specs[:keep] + [("", node_cls, f"+{len(specs) - keep} more")]
+
+    @staticmethod
+    def _nodes_or_placeholder(nodes: list, node_cls, label: str) -> list:
+        """Return parsed nodes, falling back to a single placeholder node.
+
+        Shared by the detailed diagram's clusters, which each show one
+        placeholder when Terraform defines none of that resource type.
+
+        Args:
+            nodes: Nodes built from parsed Terraform resources
+            node_cls: diagrams node class used for the placeholder
+            label: Placeholder label
+
+        Returns:
+            list: ``nodes`` if non-empty, otherwise ``[node_cls(label)]``
+        """
+        if nodes:
+            return nodes
+        return [node_cls(label)]
+
+    def _render_cached_dot_source(self, key: tuple, output_path: Path, format: str) -> bool:
+        """Render previously captured DOT source straight through Graphviz.
+
+        Args:
+            key: (diagram, render options) key into ``_DOT_SOURCE_CACHE``
+            output_path: Output file path (without extension)
+            format: Output format (png, svg, pdf)
+
+        Returns:
+            bool: True if a cached source was rendered, False on a miss
+        """
+        import graphviz
+
+        source = self._DOT_SOURCE_CACHE.get(key)
+        if source is None:
+            return False
+
+        graphviz.Source(source, engine="dot", format=format).render(
+            str(output_path), cleanup=True
+        )
+        return True
+
+    @cached_property
+    def _preferred_indices(self) -> dict[str, int]:
+        """Position of the preferred node among the parsed specs of each type.
+
+        Each type's specs are indexed by name in one pass, then the first
+        name from ``PREFERRED_NODE_NAMES`` that is present wins. Falls back to
+        the first parsed resource when none of the preferred names exist.
+        """
+        indices = {}
+        for resource_type, preferred in self.PREFERRED_NODE_NAMES.items():
+            positions = {
+                name: index
+                for index, (name, _, _) in enumerate(self._specs[resource_type])
+            }
+            indices[resource_type] = next(
+                (positions[name] for name in preferred if name in positions), 0
+            )
+        return indices
+
+    @staticmethod
+    def _cluster_if(condition: bool, label: str):
+        """Return a Cluster context if ``condition`` holds, else a no-op context.
+
+        Args:
+            condition: Whether the cluster has any parsed resources to group
+            label: Cluster label
+
+        Returns:
+            Context manager that nodes are created under
+        """
+        from diagrams import Cluster
+
+        return Cluster(label) if condition else nullcontext()
+
+    @cached_property
+    def _specs(self) -> dict[str, list[tuple]]:
+        """(resource name, node class, node label) specs per parsed resource type.
+
+        Computed on first use and kept for the builder's lifetime. diagrams
+        nodes bind to the active Diagram so they cannot be reused, but every
+        render only has to instantiate nodes from these specs. Builders that
+        only render the fixed-layout diagrams never compute them. Keys are
+        ``ec2``, ``lambda``, ``alb``, ``r53``, ``cw`` and ``iam``.
+        """
+        from diagrams.aws.compute import EC2, Lambda
+        from diagrams.aws.management import CloudwatchLogs
+        from diagrams.aws.network import ALB, Route53
+        from diagrams.aws.security import IAMRole
+
+        specs: dict[str, list[tuple]] = {
+            "ec2": [],
+            "lambda": [],
+            "alb": [],
+            "r53": [],
+            "cw": [],
+            "iam": [],
+        }
+
+        # Builders for the static workflow diagrams are created without a config
+        if self.config is None:
+            return specs
 
-        # EC2 instances
         for ec2 in self.config.ec2_instances:
             instance_type = ec2.attributes.get("instance_type", "unknown")
             base_label = f"{ec2.name}\n({instance_type})"
-            label = self._format_label_with_annotation(base_label, ec2)
-            components[f"ec2_{ec2.name}"] = EC2(label)
+            specs["ec2"].append(
+                (ec2.name, EC2, self._format_label_with_annotation(base_label, ec2))
+            )
 
-        # Lambda functions
         for lambda_fn in self.config.lambda_functions:
             runtime = lambda_fn.attributes.get("runtime", "")
             base_label = f"{lambda_fn.name}\n{runtime}"
-            label = self._format_label_with_annotation(base_label, lambda_fn)
-            components[f"lambda_{lambda_fn.name}"] = Lambda(label)
-
-        return components
-
-    def _create_network_components(self):
-        """Create networking components (ALB, EIP, Route53)."""
-        components = {}
+            specs["lambda"].append(
+                (
+                    lambda_fn.name,
+                    Lambda,
+                    self._format_label_with_annotation(base_label, lambda_fn),
+                )
+            )
 
-        # ALBs
         for alb in self.config.albs:
-            base_label = alb.name
-            label = self._format_label_with_annotation(base_label, alb)
-            components[f"alb_{alb.name}"] = ALB(label)
+            specs["alb"].append(
+                (alb.name, ALB, self._format_label_with_annotation(alb.name, alb))
+            )
 
-        # Route53 records
         for r53 in self.config.route53_records:
             domain = r53.attributes.get("domain", r53.name)
-            label = self._format_label_with_annotation(domain, r53)
-            components[f"r53_{r53.name}"] = Route53(label)
-
-        return components
-
-    def _create_observability_components(self):
-        """Create observability components (CloudWatch)."""
-        components = {}
+            specs["r53"].append(
+                (r53.name, Route53, self._format_label_with_annotation(domain, r53))
+            )
 
-        # CloudWatch Log Groups
         for cw in self.config.cloudwatch_logs:
             log_name = cw.attributes.get("log_group_name", cw.name)
             # Shorten long names
             display_name = log_name.split("/")[-1] if "/" in log_name else log_name
-            label = self._format_label_with_annotation(display_name, cw)
-            components[f"cw_{cw.name}"] = CloudwatchLogs(label)
+            specs["cw"].append(
+                (
+                    cw.name,
+                    CloudwatchLogs,
+                    self._format_label_with_annotation(display_name, cw),
+                )
+            )
 
-        return components
+        for role in self.config.iam_roles:
+            specs["iam"].append(
+                (role.name, IAMRole, role.attributes.get("role_name", role.name))
+            )
 
-    def _create_iam_components(self):
-        """Create IAM components (roles, policies)."""
-        if not self.show_iam:
-            return {}
+        # Oversized configs would stall Graphviz, so render a representative
+        # subset of each type rather than every resource
+        if self._count_spec_nodes(specs) > self.max_nodes:
+            specs = {
+                resource_type: self._summarize_if_large(type_specs)
+                for resource_type, type_specs in specs.items()
+            }
 
-        components = {}
+        return specs
 
-        # IAM Roles
-        for role in self.config.iam_roles:
-            role_name = role.attributes.get("role_name", role.name)
-            components[f"iam_{role.name}"] = IAMRole(role_name)
+    def _create_nodes(self, resource_type: str) -> list:
+        """Instantiate diagram nodes from the cached specs of one resource type."""
+        return [node_cls(label) for _, node_cls, label in self._specs[resource_type]]
+
+    def _create_compute_components(self, cluster=None):
+        """Create compute resource components (EC2, Lambda).
+
+        Returns:
+            tuple: (ec2_nodes, lambda_nodes) in parsed resource order
+        """
+        return self._create_nodes("ec2"), self._create_nodes("lambda")
+
+    def _create_network_components(self):
+        """Create networking components (ALB, Route53).
+
+        Returns:
+            tuple: (alb_nodes, route53_nodes) in parsed resource order
+        """
+        return self._create_nodes("alb"), self._create_nodes("r53")
+
+    def _create_observability_components(self):
+        """Create observability components (CloudWatch).
 
-        return components
+        Returns:
+            list: CloudWatch log group nodes in parsed resource order
+        """
+        return self._create_nodes("cw")
+
+    def _create_iam_components(self):
+        """Create IAM components (roles).
+
+        Returns:
+            list: IAM role nodes, empty when IAM display is disabled
+        """
+        if not self.show_iam:
+            return []
+
+        return self._create_nodes("iam")
 
     def build_main_diagram(
-        self, output_path: Path, format: str = "png", dpi: int = 300, fontsize_preset: str = "paper"
+        self,
+        output_path: Path,
+        format: str = "png",
+        dpi: int = 300,
+        fontsize_preset: str = "paper",
+        draft: bool = False,
     ):
         """
         Build simplified main architecture diagram for paper/poster.
@@ -254,7 +499,15 @@ class LabLinkDiagramBuilder:
             format: Output format (png, svg, pdf)
             dpi: DPI for PNG output
             fontsize_preset: Font size preset ("paper", "poster", or "presentation")
+            draft: Render a quick low-DPI SVG preview instead of the final output
         """
+        from diagrams import Cluster, Diagram, Edge
+        from diagrams.aws.compute import EC2, Lambda
+        from diagrams.aws.management import CloudwatchLogs
+        from diagrams.onprem.client import User
+
+        format, dpi = self._output_settings(format, dpi, draft)
+
         # Use helper methods for consistent attributes
         graph_attr = self._create_graph_attr(dpi=dpi, title_on_top=True, fontsize_preset=fontsize_preset)
         node_attr = self._create_node_attr(fontsize_preset=fontsize_preset)
@@ -266,6 +519,10 @@ class LabLinkDiagramBuilder:
         # We can override by passing height directly to node constructors
         node_height = {"height": "2.4"} if fontsize_preset == "poster" else {}
 
+        dot_key = ("main", dpi, fontsize_preset)
+        if self._render_cached_dot_source(dot_key, output_path, format):
+            return
+
         with Diagram(
             "LabLink Core Architecture",
             filename=str(output_path),
@@ -275,7 +532,7 @@ class LabLinkDiagramBuilder:
             graph_attr=graph_attr,
             edge_attr=edge_attr,
             node_attr=node_attr,
-        ):
+        ) as diagram:
             # External access (single admin user)
             admin = User(self._adjust_label_for_preset("Admin", fontsize_preset), **node_height)
 
@@ -315,12 +572,15 @@ class LabLinkDiagramBuilder:
 
             log_processor >> Edge(label="Callback", fontsize=edge_fontsize) >> allocator
 
+            self._DOT_SOURCE_CACHE[dot_key] = diagram.dot.source
+
     def build_detailed_diagram(
         self,
         output_path: Path,
         format: str = "png",
         dpi: int = 300,
         fontsize_preset: str = "paper",
+        draft: bool = False,
     ):
         """
         Build detailed architecture diagram showing all components from both tiers.
@@ -330,11 +590,35 @@ class LabLinkDiagramBuilder:
             format: Output format (png, svg, pdf)
             dpi: DPI for PNG output
             fontsize_preset: Font size preset ("paper", "poster", or "presentation")
+            draft: Render a quick low-DPI SVG preview instead of the final output
         """
+        from diagrams import Cluster, Diagram, Edge
+        from diagrams.aws.compute import EC2, Lambda
+        from diagrams.aws.management import CloudwatchLogs
+        from diagrams.aws.network import ALB, ELB, Route53
+        from diagrams.aws.security import IAMRole
+        from diagrams.onprem.client import Users
+
+        format, dpi = self._output_settings(format, dpi, draft)
+
         # Use preset system for consistent font sizing
         graph_attr = self._create_graph_attr(dpi=dpi, fontsize_preset=fontsize_preset)
         graph_attr["nodesep"] = "1.2"  # Override for dense clusters
         graph_attr["ranksep"] = "2.0"  # Override for multiple layers
+        # Cap dot's layout work: straight edges skip spline routing, the
+        # ns/mc limits bound rank-assignment and crossing-minimization
+        # iterations, and concentrate merges the parallel IAM "assumes" edges
+        graph_attr.update({
+            "splines": "line",
+            "nslimit": "2",
+            "nslimit1": "2",
+            "mclimit": "1",
+            "concentrate": "true",
+        })
+        if self._parsed_node_count > self.LARGE_LAYOUT_NODE_THRESHOLD:
+            # dot's layered layout becomes very slow on large configs
+            graph_attr["layout"] = "sfdp"
+            graph_attr["overlap"] = "prism"
         node_attr = self._create_node_attr(fontsize_preset=fontsize_preset)
         edge_attr = self._create_edge_attr(fontsize_preset=fontsize_preset)
         edge_fontsize = str(self.FONT_PRESETS[fontsize_preset]["edge"])
@@ -351,72 +635,68 @@ class LabLinkDiagramBuilder:
         ):
             users = Users("External Users")
 
+            # Tiers with no parsed resources only hold placeholders, so their
+            # nodes are drawn without a cluster (one less subgraph to lay out)
+            specs = self._specs
+            has_access_layer = bool(specs["alb"] or specs["r53"])
+            has_observability = bool(specs["cw"] or specs["lambda"])
+            has_iam = bool(specs["iam"])
+
             # Cluster 1: Access Layer (with annotations)
-            with Cluster("Access Layer (Configurable)"):
-                dns_components = self._create_network_components()
-                route53_nodes = [
-                    v for k, v in dns_components.items() if k.startswith("r53_")
-                ]
-                if not route53_nodes:
-                    route53_nodes = [Route53("DNS (Optional)")]
-
-                alb_nodes = [
-                    v for k, v in dns_components.items() if k.startswith("alb_")
-                ]
-                if not alb_nodes:
-                    alb_nodes = [ALB("ALB (When ACM)")]
+            with self._cluster_if(has_access_layer, "Access Layer (Configurable)"):
+                alb_nodes, route53_nodes = self._create_network_components()
+                route53_nodes = self._nodes_or_placeholder(
+                    route53_nodes, Route53, "DNS (Optional)"
+                )
+                alb_nodes = self._nodes_or_placeholder(
+                    alb_nodes, ALB, "ALB (When ACM)"
+                )
 
                 # Target groups
                 target_group = ELB("Target Group")
 
             # Cluster 2: LabLink Infrastructure
             with Cluster("LabLink Infrastructure"):
-                compute_components = self._create_compute_components()
-                ec2_nodes = [
-                    v for k, v in compute_components.items() if k.startswith("ec2_")
-                ]
-                if not ec2_nodes:
-                    ec2_nodes = [EC2("Allocator Server")]
+                ec2_nodes, lambda_nodes = self._create_compute_components()
+                ec2_nodes = self._nodes_or_placeholder(
+                    ec2_nodes, EC2, "Allocator Server"
+                )
+                # Request, provisioning and callback edges all target the allocator
+                allocator = ec2_nodes[self._preferred_indices["ec2"]]
 
             # Cluster 3: Dynamic Compute (Runtime-provisioned)
             with Cluster("Dynamic Compute (Runtime-Provisioned)"):
                 client_vms = EC2("Client VMs\n(Provisioned per experiment)")
 
             # Cluster 4: Observability & Logging
-            with Cluster("Observability & Logging"):
-                obs_components = self._create_observability_components()
-                cw_nodes = [
-                    v for k, v in obs_components.items() if k.startswith("cw_")
-                ]
-                if not cw_nodes:
-                    cw_nodes = [CloudwatchLogs("CloudWatch Logs")]
-
-                lambda_nodes = [
-                    v for k, v in compute_components.items() if k.startswith("lambda_")
-                ]
-                if not lambda_nodes:
-                    lambda_nodes = [Lambda("Log Processor")]
+            with self._cluster_if(has_observability, "Observability & Logging"):
+                cw_nodes = self._nodes_or_placeholder(
+                    self._create_observability_components(),
+                    CloudwatchLogs,
+                    "CloudWatch Logs",
+                )
+                lambda_nodes = self._nodes_or_placeholder(
+                    lambda_nodes, Lambda, "Log Processor"
+                )
 
             # Cluster 5: IAM & Permissions (if enabled)
             if self.show_iam:
-                with Cluster("IAM & Permissions"):
-                    iam_components = self._create_iam_components()
-                    iam_nodes = [
-                        v for k, v in iam_components.items() if k.startswith("iam_")
-                    ]
-                    if not iam_nodes:
-                        iam_nodes = [IAMRole("IAM Roles")]
+                with self._cluster_if(has_iam, "IAM & Permissions"):
+                    iam_nodes = self._nodes_or_placeholder(
+                        self._create_iam_components(), IAMRole, "IAM Roles"
+                    )
 
             # Define connections with minlen for cross-cluster edges
-            users >> Edge(minlen="2") >> route53_nodes[0]
+            dns = route53_nodes[self._preferred_indices["r53"]]
+            users >> Edge(minlen="2") >> dns
             if alb_nodes and len(alb_nodes) > 0:
-                route53_nodes[0] >> alb_nodes[0]
-                alb_nodes[0] >> target_group >> Edge(minlen="2") >> ec2_nodes[0]
+                dns >> alb_nodes[0]
+                alb_nodes[0] >> target_group >> Edge(minlen="2") >> allocator
             else:
-                route53_nodes[0] >> Edge(minlen="2") >> ec2_nodes[0]
+                dns >> Edge(minlen="2") >> allocator
 
             # Allocator provisions client VMs via Terraform subprocess
-            ec2_nodes[0] >> Edge(
+            allocator >> Edge(
                 style="dashed",
                 label="provisions via\nTerraform",
                 fontsize=edge_fontsize,
@@ -442,32 +722,24 @@ class LabLinkDiagramBuilder:
                 lambda_nodes[0] >> Edge(
                     label="POST /api/vm-logs",
                     fontsize=edge_fontsize
-                ) >> ec2_nodes[0]
+                ) >> allocator
 
-            # IAM connections (show permissions with dotted lines)
+            # IAM connections (show permissions with dotted lines). A single
+            # edge fans out to every EC2, Lambda and the client VMs, which also
+            # assume an IAM role; concentrate merges the parallel edges.
             if self.show_iam and iam_nodes:
-                for ec2 in ec2_nodes:
-                    iam_nodes[0] >> Edge(
-                        style="dotted",
-                        label="assumes",
-                        fontsize=edge_fontsize
-                    ) >> ec2
-                if lambda_nodes:
-                    for lambda_fn in lambda_nodes:
-                        iam_nodes[0] >> Edge(
-                            style="dotted",
-                            label="assumes",
-                            fontsize=edge_fontsize
-                        ) >> lambda_fn
-                # Client VMs also have IAM role
                 iam_nodes[0] >> Edge(
                     style="dotted",
                     label="assumes",
                     fontsize=edge_fontsize
-                ) >> client_vms
+                ) >> (ec2_nodes + lambda_nodes + [client_vms])
 
     def build_network_flow_diagram(
-        self, output_path: Path, format: str = "png", dpi: int = 300
+        self,
+        output_path: Path,
+        format: str = "png",
+        dpi: int = 300,
+        draft: bool = False,
     ):
         """
         Build network flow diagram focusing on request routing.
@@ -476,14 +748,29 @@ class LabLinkDiagramBuilder:
             output_path: Path where diagram will be saved (without extension)
             format: Output format (png, svg, pdf)
             dpi: DPI for PNG output
+            draft: Render a quick low-DPI SVG preview instead of the final output
         """
+        from diagrams import Diagram, Edge
+        from diagrams.aws.compute import EC2
+        from diagrams.aws.network import ALB, Route53
+        from diagrams.onprem.client import Users
+
+        format, dpi = self._output_settings(format, dpi, draft)
+
+        # Straight edges skip spline routing for this simple linear flow
         graph_attr = {
             "fontsize": "14",
             "bgcolor": "white",
             "dpi": str(dpi),
             "rankdir": "LR",
+            "splines": "line",
+            "concentrate": "true",
         }
 
+        dot_key = ("network_flow", dpi)
+        if self._render_cached_dot_source(dot_key, output_path, format):
+            return
+
         with Diagram(
             "LabLink Network Flow",
             filename=str(output_path),
@@ -491,7 +778,7 @@ class LabLinkDiagramBuilder:
             show=False,
             direction="LR",
             graph_attr=graph_attr,
-        ):
+        ) as diagram:
             users = Users("Client Request")
 
             # DNS resolution
@@ -512,6 +799,8 @@ class LabLinkDiagramBuilder:
             alb >> Edge(label="3. HTTP:5000\nTarget Group") >> allocator
             allocator >> Edge(label="4. JSON\nResponse") >> api_response
 
+            self._DOT_SOURCE_CACHE[dot_key] = diagram.dot.source
+
     def build_vm_provisioning_diagram(
         self,
         output_path: Path,
@@ -1534,12 +1823,166 @@ class LabLinkDiagramBuilder:
         print(f"Database schema diagram saved to {output_path}")
 
 
+@lru_cache(maxsize=1)
+def _renderer_versions() -> dict[str, str | None]:
+    """Versions of the tools that render diagrams, looked up once per process.
+
+    A tool upgrade changes the rendered output, so these are part of the
+    diagram cache key.
+    """
+    from importlib.metadata import PackageNotFoundError, version
+
+    import graphviz
+
+    try:
+        diagrams_version = version("diagrams")
+    except PackageNotFoundError:
+        diagrams_version = None
+    try:
+        dot_version = ".".join(map(str, graphviz.version()))
+    except (RuntimeError, subprocess.CalledProcessError):
+        # ExecutableNotFound (no dot on PATH) is a RuntimeError
+        dot_version = None
+
+    return {
+        "diagrams": diagrams_version,
+        "graphviz": dot_version,
+        "cairosvg": getattr(cairosvg, "__version__", None),
+    }
+
+
+def _config_hash(builder: LabLinkDiagramBuilder, method_name: str, **options) -> str:
+    """Hash everything that determines a rendered diagram's content.
+
+    Args:
+        builder: Builder holding the parsed configuration and display flags
+        method_name: Name of the ``build_*`` method that renders the diagram
+        **options: Keyword arguments passed to the build method
+
+    Returns:
+        str: Hex digest identifying the rendered output
+    """
+    payload = json.dumps(
+        {
+            "config": dataclasses.asdict(builder.config),
+            "show_iam": builder.show_iam,
+            "show_security_groups": builder.show_security_groups,
+            "max_nodes": builder.max_nodes,
+            "method": method_name,
+            "options": options,
+            "source": _SOURCE_DIGEST,
+            "renderers": _renderer_versions(),
+            # PNGs are rasterized differently when cairosvg is installed
+            "cairosvg": cairosvg is not None,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _build_diagram(
+    builder: LabLinkDiagramBuilder,
+    method_name: str,
+    output_path: Path,
+    format: str,
+    **options,
+) -> None:
+    """
+    Call a ``build_*`` method, rasterizing PNGs from SVG when cairosvg is available.
+
+    Graphviz's PNG backend paints the whole high-DPI canvas through
+    Pango/Cairo; emitting SVG and rasterizing it once with cairosvg at the
+    requested DPI is cheaper and produces the same image.
+
+    Args:
+        builder: Configured diagram builder
+        method_name: Name of the ``build_*`` method to call
+        output_path: Output file path (without extension)
+        format: Output format (png, svg, pdf)
+        **options: Extra keyword arguments for the build method
+    """
+    build = getattr(builder, method_name)
+
+    if format != "png" or cairosvg is None:
+        build(output_path, format=format, **options)
+        return
+
+    svg_file = Path(f"{output_path}.svg")
+    svg_existed = svg_file.exists()
+    build(output_path, format="svg", **options)
+    # Graphviz already scales SVG coordinates by the graph's dpi attribute, so
+    # one pixel per point reproduces the size of its own PNG output (checked by
+    # test_cairosvg_png_matches_graphviz_png_size); passing the requested dpi
+    # here would scale twice. Node icons are referenced as local files, hence
+    # unsafe=True.
+    cairosvg.svg2png(
+        url=str(svg_file),
+        write_to=f"{output_path}.png",
+        dpi=72,
+        unsafe=True,
+    )
+    if not svg_existed:
+        svg_file.unlink()
+
+
+def _render_cached(
+    builder: LabLinkDiagramBuilder,
+    method_name: str,
+    output_path: Path,
+    format: str,
+    use_cache: bool = False,
+    **options,
+) -> Path:
+    """
+    Render a diagram, reusing a previously rendered file for identical inputs.
+
+    On a cache hit the cached file is copied to the output location and
+    Graphviz is not invoked at all.
+
+    Args:
+        builder: Configured diagram builder
+        method_name: Name of the ``build_*`` method to call on a cache miss
+        output_path: Output file path (without extension)
+        format: Output format (png, svg, pdf)
+        use_cache: Whether to read from and write to the diagram cache
+        **options: Extra keyword arguments for the build method
+
+    Returns:
+        Path: The rendered output file
+    """
+    output_file = Path(f"{output_path}.{format}")
+
+    if not use_cache:
+        _build_diagram(builder, method_name, output_path, format, **options)
+        return output_file
+
+    key = _config_hash(builder, method_name, format=format, **options)
+    cached_file = DIAGRAM_CACHE_DIR / f"{key}.{format}"
+
+    if cached_file.exists():
+        shutil.copyfile(cached_file, output_file)
+        return output_file
+
+    _build_diagram(builder, method_name, output_path, format, **options)
+
+    # Write to a temporary name first so concurrent runs never see a partial file
+    DIAGRAM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_file = cached_file.with_name(f"{cached_file.name}.{os.getpid()}.tmp")
+    shutil.copyfile(output_file, tmp_file)
+    os.replace(tmp_file, cached_file)
+
+    return output_file
+
+
 def generate_main_diagram(
     config: ParsedTerraformConfig,
     output_path: Path,
     format: str = "png",
     dpi: int = 300,
     fontsize_preset: str = "paper",
+    use_cache: bool = False,
+    draft: bool = False,
 ):
     """
     Generate main architecture diagram.
@@ -1550,9 +1993,22 @@ def generate_main_diagram(
         format: Output format (png, svg, pdf)
         dpi: DPI for PNG output
         fontsize_preset: Font size preset ("paper", "poster", or "presentation")
+        use_cache: Reuse a previously rendered diagram for identical inputs
+            (opt-in; reads and writes ``DIAGRAM_CACHE_DIR``)
+        draft: Render a quick low-DPI SVG preview instead of the final output
     """
+    format, dpi = LabLinkDiagramBuilder._output_settings(format, dpi, draft)
+
     builder = LabLinkDiagramBuilder(config, show_iam=False, show_security_groups=False)
-    builder.build_main_diagram(output_path, format=format, dpi=dpi, fontsize_preset=fontsize_preset)
+    _render_cached(
+        builder,
+        "build_main_diagram",
+        output_path,
+        format,
+        use_cache=use_cache,
+        dpi=dpi,
+        fontsize_preset=fontsize_preset,
+    )
 
 
 def generate_detailed_diagram(
@@ -1560,6 +2016,8 @@ def generate_detailed_diagram(
     output_path: Path,
     format: str = "png",
     dpi: int = 300,
+    use_cache: bool = False,
+    draft: bool = False,
 ):
     """
     Generate detailed architecture diagram.
@@ -1569,9 +2027,21 @@ def generate_detailed_diagram(
         output_path: Output file path (without extension)
         format: Output format (png, svg, pdf)
         dpi: DPI for PNG output
+        use_cache: Reuse a previously rendered diagram for identical inputs
+            (opt-in; reads and writes ``DIAGRAM_CACHE_DIR``)
+        draft: Render a quick low-DPI SVG preview instead of the final output
     """
+    format, dpi = LabLinkDiagramBuilder._output_settings(format, dpi, draft)
+
     builder = LabLinkDiagramBuilder(config, show_iam=True, show_security_groups=True)
-    builder.build_detailed_diagram(output_path, format=format, dpi=dpi)
+    _render_cached(
+        builder,
+        "build_detailed_diagram",
+        output_path,
+        format,
+        use_cache=use_cache,
+        dpi=dpi,
+    )
 
 
 def generate_network_flow_diagram(
@@ -1579,6 +2049,8 @@ def generate_network_flow_diagram(
     output_path: Path,
     format: str = "png",
     dpi: int = 300,
+    use_cache: bool = False,
+    draft: bool = False,
 ):
     """
     Generate network flow diagram.
@@ -1588,6 +2060,83 @@ def generate_network_flow_diagram(
         output_path: Output file path (without extension)
         format: Output format (png, svg, pdf)
         dpi: DPI for PNG output
+        use_cache: Reuse a previously rendered diagram for identical inputs
+            (opt-in; reads and writes ``DIAGRAM_CACHE_DIR``)
+        draft: Render a quick low-DPI SVG preview instead of the final output
     """
+    format, dpi = LabLinkDiagramBuilder._output_settings(format, dpi, draft)
+
     builder = LabLinkDiagramBuilder(config, show_iam=False, show_security_groups=False)
-    builder.build_network_flow_diagram(output_path, format=format, dpi=dpi)
\ No newline at end of file
+    _render_cached(
+        builder,
+        "build_network_flow_diagram",
+        output_path,
+        format,
+        use_cache=use_cache,
+        dpi=dpi,
+    )
+
+
+def generate_all(
+    config: ParsedTerraformConfig,
+    output_dir: Path,
+    format: str = "png",
+    dpi: int = 300,
+    fontsize_preset: str = "paper",
+    use_cache: bool = False,
+    draft: bool = False,
+) -> list[Path]:
+    """
+    Generate the main, detailed, and network flow diagrams concurrently.
+
+    Each diagram is rendered by its own Graphviz subprocess, so the three are
+    run in separate worker processes rather than threads (the diagrams library
+    keeps the active diagram in module-level state). Each call gets its own
+    pool, so a crashed worker cannot break later calls.
+
+    Args:
+        config: Parsed Terraform configuration
+        output_dir: Directory to write the diagrams into
+        format: Output format (png, svg, pdf)
+        dpi: DPI for PNG output
+        fontsize_preset: Font size preset for the main diagram
+        use_cache: Reuse previously rendered diagrams for identical inputs
+            (opt-in; reads and writes ``DIAGRAM_CACHE_DIR``)
+        draft: Render quick low-DPI SVG previews instead of the final output
+
+    Returns:
+        Paths of the generated files, in main/detailed/network-flow order
+    """
+    format, dpi = LabLinkDiagramBuilder._output_settings(format, dpi, draft)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    jobs = [
+        (
+            generate_main_diagram,
+            output_dir / "lablink-architecture",
+            {"fontsize_preset": fontsize_preset},
+        ),
+        (generate_detailed_diagram, output_dir / "lablink-architecture-detailed", {}),
+        (generate_network_flow_diagram, output_dir / "lablink-network-flow", {}),
+    ]
+
+    with ProcessPoolExecutor(max_workers=_GENERATE_ALL_WORKERS) as executor:
+        futures = [
+            executor.submit(
+                fn,
+                config,
+                output_path,
+                format=format,
+                dpi=dpi,
+                use_cache=use_cache,
+                **kwargs,
+            )
+            for fn, output_path, kwargs in jobs
+        ]
+        # Surface any worker exception in the caller
+        for future in futures:
+            future.result()
+
+    return [Path(f"{output_path}.{format}") for _, output_path, _ in jobs]
@@ -1,6 +1,6 @@
 """GPU cost analysis module for visualizing ML hardware pricing trends."""
 
-from .filters import categorize_gpu, is_ml_relevant
+from .filters import categorize_gpu, categorize_gpus, is_ml_relevant, ml_relevance_mask
 from .loader import load_gpu_dataset
 from .processor import calculate_statistics, filter_ml_gpus, prepare_time_series
 
@@ -8,6 +8,8 @@ __all__ = [
     "load_gpu_dataset",
     "is_ml_relevant",
     "categorize_gpu",
+    "ml_relevance_mask",
+    "categorize_gpus",
     "filter_ml_gpus",
     "calculate_statistics",
     "prepare_time_series",
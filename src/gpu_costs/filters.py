@@ -1,9 +1,33 @@
 """Filter GPUs by relevance to machine learning and scientific computing."""
 
+import re
 from typing import Literal
 
+import numpy as np
 import pandas as pd
 
+# Name patterns matched against lowercased GPU names, compiled once at import
+_MOBILE_PAT = re.compile(r"mobile|laptop|max-?q")
+_ML_PRO_PAT = re.compile(r"tesla|a100|h100|v100|p100|a6000|rtx 6000")
+_PRO_PAT = re.compile(
+    r"tesla|a100|h100|v100|p100|a6000|a5000|a4000|rtx 6000|rtx 5000|rtx 4000"
+)
+_CONSUMER_PAT = re.compile(r"rtx|gtx")
+_PRO_MODEL_PAT = re.compile(r"6000|5000")
+
+
+def _row_name_lower(gpu_row: pd.Series) -> str:
+    """Lowercased GPU name for the row-wise filters.
+
+    Rows that already carry a ``_name_lower`` field (e.g. from
+    ``dataset.assign(_name_lower=lowercase_names(dataset))``) reuse it, so
+    running both row-wise filters lowercases each name only once.
+    """
+    name_lower = gpu_row.get("_name_lower")
+    if isinstance(name_lower, str):
+        return name_lower
+    return str(gpu_row.get("name", "")).lower()
+
 
 def is_ml_relevant(gpu_row: pd.Series) -> bool:
     """Check if GPU is relevant for ML/scientific computing workloads.
@@ -14,21 +38,18 @@ def is_ml_relevant(gpu_row: pd.Series) -> bool:
     Returns:
         True if GPU should be included in analysis
     """
-    name_lower = str(gpu_row.get("name", "")).lower()
+    name_lower = _row_name_lower(gpu_row)
 
     # Exclude mobile/embedded GPUs
-    if any(x in name_lower for x in ["mobile", "laptop", "max-q", "maxq"]):
+    if _MOBILE_PAT.search(name_lower):
         return False
 
     # Include professional datacenter GPUs
-    if any(
-        x in name_lower
-        for x in ["tesla", "a100", "h100", "v100", "p100", "a6000", "rtx 6000"]
-    ):
+    if _ML_PRO_PAT.search(name_lower):
         return True
 
     # Include consumer cards with sufficient performance (SLEAP-compatible)
-    if "rtx" in name_lower or "gtx" in name_lower:
+    if _CONSUMER_PAT.search(name_lower):
         # Check FP32 performance as proxy for ML capability
         fp32 = gpu_row.get("fp32_tflops", 0)
         if pd.notna(fp32) and fp32 >= 5.0:
@@ -46,31 +67,81 @@ def categorize_gpu(gpu_row: pd.Series) -> Literal["professional", "consumer", "o
     Returns:
         Category: "professional", "consumer", or "other"
     """
-    name_lower = str(gpu_row.get("name", "")).lower()
+    name_lower = _row_name_lower(gpu_row)
 
     # Professional datacenter GPUs
-    if any(
-        x in name_lower
-        for x in [
-            "tesla",
-            "a100",
-            "h100",
-            "v100",
-            "p100",
-            "a6000",
-            "a5000",
-            "a4000",
-            "rtx 6000",
-            "rtx 5000",
-            "rtx 4000",
-        ]
-    ):
+    if _PRO_PAT.search(name_lower):
         return "professional"
 
     # Consumer RTX/GTX series
-    if any(x in name_lower for x in ["rtx", "gtx"]):
+    if _CONSUMER_PAT.search(name_lower):
         # Exclude professional RTX (already handled above)
-        if "6000" not in name_lower and "5000" not in name_lower:
+        if not _PRO_MODEL_PAT.search(name_lower):
             return "consumer"
 
     return "other"
+
+
+def lowercase_names(dataset: pd.DataFrame) -> pd.Series:
+    """Lowercase the name column once for the column-wise filters.
+
+    Args:
+        dataset: GPU dataset with a name column
+
+    Returns:
+        Lowercased names (missing names stay missing)
+    """
+    names = dataset["name"]
+    # A string dtype keeps missing names as <NA> (astype(str) would turn them
+    # into "nan"); an existing one, e.g. Arrow-backed, is kept as is
+    if not isinstance(names.dtype, pd.StringDtype):
+        names = names.astype("string")
+    return names.str.lower()
+
+
+def ml_relevance_mask(
+    dataset: pd.DataFrame, names: pd.Series | None = None
+) -> pd.Series:
+    """Vectorized equivalent of ``is_ml_relevant`` over a whole dataset.
+
+    Args:
+        dataset: GPU dataset with name and fp32_tflops columns
+        names: Optional precomputed ``lowercase_names(dataset)``
+
+    Returns:
+        Boolean Series, True for rows that should be included in analysis
+    """
+    if names is None:
+        names = lowercase_names(dataset)
+
+    mobile = names.str.contains(_MOBILE_PAT, na=False)
+    pro = names.str.contains(_ML_PRO_PAT, na=False)
+    consumer_like = names.str.contains(_CONSUMER_PAT, na=False)
+    fp32_ok = dataset["fp32_tflops"].fillna(0) >= 5.0
+
+    return ~mobile & (pro | (consumer_like & fp32_ok))
+
+
+def categorize_gpus(
+    dataset: pd.DataFrame, names: pd.Series | None = None
+) -> np.ndarray:
+    """Vectorized equivalent of ``categorize_gpu`` over a whole dataset.
+
+    Args:
+        dataset: GPU dataset with a name column
+        names: Optional precomputed ``lowercase_names(dataset)``
+
+    Returns:
+        Array of "professional", "consumer", or "other", one per row
+    """
+    if names is None:
+        names = lowercase_names(dataset)
+
+    pro = names.str.contains(_PRO_PAT, na=False).to_numpy()
+    consumer = (
+        names.str.contains(_CONSUMER_PAT, na=False)
+        & ~names.str.contains(_PRO_MODEL_PAT, na=False)
+    ).to_numpy()
+
+    # First matching condition wins, so professional takes precedence
+    return np.select([pro, consumer], ["professional", "consumer"], default="other")
@@ -1,9 +1,18 @@
 """Load and validate GPU pricing data from Epoch AI dataset."""
 
+import importlib.util
 from pathlib import Path
 
 import pandas as pd
 
+if importlib.util.find_spec("pyarrow") is not None:
+    # Multithreaded CSV parsing and Arrow-backed strings for the name filters
+    _CSV_ENGINE = "pyarrow"
+    _STRING_DTYPE = "string[pyarrow]"
+else:
+    _CSV_ENGINE = "c"
+    _STRING_DTYPE = "string"
+
 
 def load_gpu_dataset(path: str | Path) -> pd.DataFrame:
     """Load GPU dataset from Epoch AI ML Hardware CSV.
@@ -30,11 +39,6 @@ def load_gpu_dataset(path: str | Path) -> pd.DataFrame:
             "See data/raw/gpu_prices/README.md for detailed instructions."
         )
 
-    try:
-        df = pd.read_csv(path)
-    except Exception as e:
-        raise ValueError(f"Failed to parse CSV file: {e}")
-
     # Map Epoch AI column names to our expected names
     column_mapping = {
         "Hardware name": "name",
@@ -43,29 +47,51 @@ def load_gpu_dataset(path: str | Path) -> pd.DataFrame:
         "FP32 (single precision) performance (FLOP/s)": "fp32_flops",
     }
 
+    # Only parse the columns we use, with dtypes and dates handled by the
+    # reader in a single pass
+    try:
+        df = pd.read_csv(
+            path,
+            engine=_CSV_ENGINE,
+            usecols=list(column_mapping),
+            dtype={
+                "Hardware name": _STRING_DTYPE,
+                "Release price (USD)": "float64",
+                "FP32 (single precision) performance (FLOP/s)": "float64",
+            },
+            parse_dates=["Release date"],
+        )
+    except Exception as e:
+        # Only on failure: re-read the header to report missing columns clearly
+        try:
+            header = list(pd.read_csv(path, nrows=0).columns)
+        except Exception:
+            header = []
+        missing_columns = [
+            name for column, name in column_mapping.items() if column not in header
+        ]
+        if header and missing_columns:
+            raise ValueError(
+                f"Dataset is missing required columns: {missing_columns}\n"
+                f"Found columns: {header}\n"
+                "Please ensure you're using the correct Epoch AI dataset."
+            )
+        raise ValueError(f"Failed to parse CSV file: {e}")
+
     # Rename columns
     df = df.rename(columns=column_mapping)
 
-    # Validate required columns exist after mapping
-    required_columns = ["name", "release_date", "price", "fp32_flops"]
-    missing_columns = [col for col in required_columns if col not in df.columns]
-
-    if missing_columns:
-        raise ValueError(
-            f"Dataset is missing required columns: {missing_columns}\n"
-            f"Found columns: {list(df.columns)}\n"
-            "Please ensure you're using the correct Epoch AI dataset."
-        )
+    # Readers leave dates they could not convert as strings (the pyarrow engine
+    # does so for columns with nulls on pandas 2), so finish those here
+    if not pd.api.types.is_datetime64_any_dtype(df["release_date"]):
+        try:
+            df["release_date"] = pd.to_datetime(df["release_date"])
+        except Exception as e:
+            raise ValueError(f"Failed to parse release_date column: {e}")
 
     # Convert FP32 FLOP/s to TFLOP/s
     df["fp32_tflops"] = df["fp32_flops"] / 1e12
 
-    # Parse dates to datetime
-    try:
-        df["release_date"] = pd.to_datetime(df["release_date"])
-    except Exception as e:
-        raise ValueError(f"Failed to parse release_date column: {e}")
-
     # Validate date range (rough check for data quality)
     min_year = df["release_date"].dt.year.min()
     max_year = df["release_date"].dt.year.max()
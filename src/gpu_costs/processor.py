@@ -2,9 +2,10 @@
 
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
-from .filters import categorize_gpu, is_ml_relevant
+from .filters import categorize_gpus, lowercase_names, ml_relevance_mask
 
 
 def filter_ml_gpus(dataset: pd.DataFrame) -> pd.DataFrame:
@@ -16,15 +17,21 @@ def filter_ml_gpus(dataset: pd.DataFrame) -> pd.DataFrame:
     Returns:
         Filtered DataFrame with only ML-relevant GPUs
     """
-    # Apply ML relevance filter
-    mask = dataset.apply(is_ml_relevant, axis=1)
-    filtered = dataset[mask].copy()
-
-    # Add category column
-    filtered["category"] = filtered.apply(categorize_gpu, axis=1)
-
-    # Filter out "other" category
-    filtered = filtered[filtered["category"].isin(["professional", "consumer"])]
+    # Unnamed rows can never match, so drop them before any string work
+    has_name = dataset["name"].notna()
+    candidates = dataset if has_name.all() else dataset[has_name]
+
+    # Evaluate relevance and category over the whole column in one pass each
+    names = lowercase_names(candidates)
+    category = categorize_gpus(candidates, names)
+
+    # Keep ML-relevant GPUs, dropping the "other" category
+    keep = ml_relevance_mask(candidates, names).to_numpy() & (category != "other")
+    filtered = candidates[keep].copy()
+    # Categorical codes make downstream category comparisons and groupbys cheap
+    filtered["category"] = pd.Categorical(
+        category[keep], categories=["professional", "consumer"]
+    )
 
     return filtered
 
@@ -47,26 +54,32 @@ def calculate_statistics(dataset: pd.DataFrame) -> dict[str, Any]:
         "max": dataset["release_date"].max(),
     }
 
-    # Price statistics (filter out missing prices)
-    priced = dataset[dataset["price"].notna() & (dataset["price"] > 0)]
-    stats["price_completeness"] = len(priced) / len(dataset) if len(dataset) > 0 else 0
+    # Price statistics on the raw price column (NaN fails the > 0 test, so
+    # missing prices are filtered out too)
+    price = dataset["price"].to_numpy(dtype="float64", na_value=np.nan)
+    valid = price > 0
+    good_price = price[valid]
+    stats["price_completeness"] = (
+        len(good_price) / len(dataset) if len(dataset) > 0 else 0
+    )
 
-    if len(priced) > 0:
+    if len(good_price) > 0:
         stats["price_overall"] = {
-            "min": priced["price"].min(),
-            "max": priced["price"].max(),
-            "median": priced["price"].median(),
+            "min": good_price.min(),
+            "max": good_price.max(),
+            "median": np.median(good_price),
         }
 
         # Per-category statistics
+        category_values = dataset["category"].to_numpy()
         for category in ["professional", "consumer"]:
-            cat_data = priced[priced["category"] == category]
-            if len(cat_data) > 0:
+            cat_price = price[valid & (category_values == category)]
+            if len(cat_price) > 0:
                 stats[f"price_{category}"] = {
-                    "count": len(cat_data),
-                    "min": cat_data["price"].min(),
-                    "max": cat_data["price"].max(),
-                    "median": cat_data["price"].median(),
+                    "count": len(cat_price),
+                    "min": cat_price.min(),
+                    "max": cat_price.max(),
+                    "median": np.median(cat_price),
                 }
             else:
                 stats[f"price_{category}"] = {
@@ -77,9 +90,9 @@ def calculate_statistics(dataset: pd.DataFrame) -> dict[str, Any]:
                 }
 
     # Performance statistics
-    perf = dataset[dataset["fp32_tflops"].notna()]
+    perf_count = int(dataset["fp32_tflops"].notna().sum())
     stats["performance_completeness"] = (
-        len(perf) / len(dataset) if len(dataset) > 0 else 0
+        perf_count / len(dataset) if len(dataset) > 0 else 0
     )
 
     return stats
@@ -97,20 +110,17 @@ def prepare_time_series(
     Returns:
         DataFrame sorted by date, optionally filtered by category
     """
-    df = dataset.copy()
-
-    # Filter by category if specified
+    # Filter to rows with valid price and date (and the category, if given)
+    # with one combined mask, so only the final slice is copied
+    price = dataset["price"]
+    mask = price.notna() & (price > 0) & dataset["release_date"].notna()
     if category is not None:
-        df = df[df["category"] == category]
-
-    # Filter to rows with valid price and date
-    df = df[df["price"].notna() & (df["price"] > 0)]
-    df = df[df["release_date"].notna()]
+        mask &= dataset["category"].to_numpy() == category
 
     # Sort by date
-    df = df.sort_values("release_date")
+    df = dataset.loc[mask].sort_values("release_date")
 
     # Add year column for easier plotting
-    df["year"] = df["release_date"].dt.year
+    df["year"] = df["release_date"].dt.year.astype("int16")
 
-    return df
\ No newline at end of file
+    return df
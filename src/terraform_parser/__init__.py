@@ -1,5 +1,17 @@
 """Terraform configuration file parser for extracting infrastructure resources."""
 
-from .parser import parse_directory, parse_terraform_file
+from .parser import (
+    iter_terraform_file,
+    parse_directory,
+    parse_directory_cached,
+    parse_terraform_file,
+    parse_terraform_string,
+)
 
-__all__ = ["parse_terraform_file", "parse_directory"]
\ No newline at end of file
+__all__ = [
+    "parse_terraform_file",
+    "parse_terraform_string",
+    "iter_terraform_file",
+    "parse_directory",
+    "parse_directory_cached",
+]
@@ -1,12 +1,45 @@
 """Parse Terraform configuration files to extract infrastructure resources."""
 
+import hashlib
+import os
+import pickle
 import re
+import sys
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from itertools import chain
 from pathlib import Path
-from typing import Any
-
-
-@dataclass
+from typing import Any, Callable, Iterator
+
+# Parsed directories are cached here, keyed by the .tf files' names, sizes and
+# mtimes plus this module's source (so parser edits invalidate it)
+PARSE_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    / "lablink-paper-figures"
+    / "tfparse"
+)
+_SOURCE_DIGEST = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=8).hexdigest()
+# Writing a new cache entry drops all but this many of the most recent ones
+_PARSE_CACHE_MAX_ENTRIES = 32
+
+# When at least this many .tf files need parsing, they go to a process pool;
+# below it, pool startup costs more than the parsing itself
+_PARALLEL_PARSE_MIN_FILES = 16
+
+# Pickled per-file parses keyed by (path, mtime_ns, size), least recently
+# used first. Shared by parse_terraform_file and both parse_directory paths.
+_PARSED_FILES: OrderedDict[tuple[str, int, int], bytes] = OrderedDict()
+_PARSED_FILES_MAX = 128
+
+# Pickled parses keyed by a blake2b digest of the content, least recently used
+# first. Keying on the digest keeps whole .tf files out of the memo's keys.
+_PARSED_STRINGS: OrderedDict[bytes, bytes] = OrderedDict()
+_PARSED_STRINGS_MAX = 64
+
+
+@dataclass(slots=True)
 class TerraformResource:
     """Represents a Terraform resource definition."""
 
@@ -19,7 +52,7 @@ class TerraformResource:
     tier: str = "infrastructure"  # "infrastructure" or "client_vm"
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedTerraformConfig:
     """Collection of parsed Terraform resources."""
 
@@ -39,244 +72,433 @@ class ParsedTerraformConfig:
 
     def get_all_resources(self) -> list[TerraformResource]:
         """Get all resources as a flat list."""
-        return (
-            self.ec2_instances
-            + self.security_groups
-            + self.albs
-            + self.eips
-            + self.route53_records
-            + self.lambda_functions
-            + self.cloudwatch_logs
-            + self.iam_roles
-            + self.iam_policies
-            + self.target_groups
+        # One list built from the chain, instead of one copy per concatenation
+        return list(self.iter_all_resources())
+
+    def iter_all_resources(self) -> Iterator[TerraformResource]:
+        """Iterate over all resources without building a combined list."""
+        return chain(
+            self.ec2_instances,
+            self.security_groups,
+            self.albs,
+            self.eips,
+            self.route53_records,
+            self.lambda_functions,
+            self.cloudwatch_logs,
+            self.iam_roles,
+            self.iam_policies,
+            self.target_groups,
         )
 
 
-def parse_terraform_file(file_path: Path) -> ParsedTerraformConfig:
+# Opening line of a resource block; the body is found by brace matching
+_RESOURCE_HEADER_RE = re.compile(
+    r'resource\s+"(?P<rtype>[^"]+)"\s+"(?P<rname>[^"]+)"\s*\{'
+)
+# Top-level locals block header (not a local.* reference)
+_LOCALS_HEADER_RE = re.compile(r"^\s*locals\s*\{", re.MULTILINE)
+# Tokens that matter when matching a block's braces. Strings, comments and
+# heredoc bodies are consumed whole so braces inside them are not counted.
+_BLOCK_TOKEN_RE = re.compile(
+    r'(?P<open>\{)|(?P<close>\})'
+    r'|"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
+    r"|(?:#|//)[^\n]*|/\*.*?\*/"
+    r"|<<-?(?P<heredoc>\w+)[ \t]*\n",
+    re.DOTALL,
+)
+
+# Only these resource types are marked conditional when their count is a ternary
+_CONDITIONAL_TYPES = frozenset({
+    "aws_instance",
+    "aws_lb",
+    "aws_route53_record",
+    "aws_lambda_function",
+    "aws_cloudwatch_log_group",
+    "aws_lb_target_group",
+})
+
+# Patterns used outside the per-type attribute specs, compiled once at import
+_RE_INGRESS_BLOCK = re.compile(r'ingress\s*\{([^}]+)\}', re.DOTALL)
+_RE_COUNT = re.compile(r'count\s*=\s*(.+?)(?:\n|$)')
+_RE_LOCAL_STRING = re.compile(r'(\w+)\s*=\s*"([^"]+)"')
+_RE_LOCAL_EQUALITY = re.compile(r'(\w+)\s*=\s*(\S+)\s*==\s*"([^"]+)"')
+
+# Attribute patterns per resource type: attribute key -> regex with one capture
+# group. The first match of each pattern in a resource body wins.
+_RESOURCE_SPECS: dict[str, tuple[str, dict[str, str]]] = {
+    "aws_instance": ("ec2_instances", {
+        # Quoted strings AND local references (resolved later)
+        "instance_type": r'instance_type\s*=\s*("[^"]+"|local\.\w+)',
+        "ami": r'ami\s*=\s*"([^"]+)"',
+        "security_groups": r'vpc_security_group_ids\s*=\s*\[([^\]]+)\]',
+        "iam_role": r'iam_instance_profile\s*=\s*[^.\n]+\.([^.\n]+)\.name',
+    }),
+    "aws_lb": ("albs", {
+        "type": r'load_balancer_type\s*=\s*"([^"]+)"',
+    }),
+    "aws_eip": ("eips", {}),
+    "aws_route53_record": ("route53_records", {
+        "record_type": r'type\s*=\s*"([^"]+)"',
+        "domain": r'name\s*=\s*"([^"]+)"',
+    }),
+    "aws_lambda_function": ("lambda_functions", {
+        "function_name": r'function_name\s*=\s*"([^"]+)"',
+        "runtime": r'runtime\s*=\s*"([^"]+)"',
+        "iam_role": r'role\s*=\s*[^.\n]+\.([^.\n]+)\.arn',
+    }),
+    "aws_cloudwatch_log_group": ("cloudwatch_logs", {
+        "log_group_name": r'name\s*=\s*"([^"]+)"',
+    }),
+    "aws_iam_role": ("iam_roles", {
+        "role_name": r'name\s*=\s*"([^"]+)"',
+    }),
+    "aws_iam_policy": ("iam_policies", {
+        "policy_name": r'name\s*=\s*"([^"]+)"',
+    }),
+    "aws_lb_target_group": ("target_groups", {
+        "port": r'port\s*=\s*(\d+)',
+        "protocol": r'protocol\s*=\s*"([^"]+)"',
+    }),
+    "aws_cloudwatch_log_subscription_filter": ("subscription_filters", {
+        "destination_arn": r'destination_arn\s*=\s*(\S+)',
+        "log_group_name": r'log_group_name\s*=\s*(\S+)',
+        "filter_pattern": r'filter_pattern\s*=\s*"([^"]*)"',
+    }),
+}
+
+_INGRESS_SPEC = {
+    "from_port": r'from_port\s*=\s*(\d+)',
+    "to_port": r'to_port\s*=\s*(\d+)',
+    "protocol": r'protocol\s*=\s*"([^"]+)"',
+}
+
+
+def _split_list(value: str) -> list[str]:
+    """Split a captured HCL list body into its unquoted items."""
+    return [item.strip().strip('"') for item in value.split(",") if item.strip()]
+
+
+# Conversions applied to raw captures, by attribute key
+_ATTRIBUTE_CONVERTERS: dict[str, Callable[[str], Any]] = {
+    "instance_type": lambda value: value.strip('"'),
+    "security_groups": _split_list,
+    "port": int,
+    "from_port": int,
+    "to_port": int,
+}
+
+
+def _attribute_extractor(spec: dict[str, str]) -> Callable[[str], dict[str, Any]]:
     """
-    Parse a single Terraform file and extract resource definitions.
+    Build a function extracting a spec's attributes from a block body.
+
+    All patterns are combined into one regex of named alternatives, so a
+    single ``finditer`` over the body reports every attribute and
+    ``match.lastgroup`` says which one it was.
+
+    Args:
+        spec: Attribute key -> regex with exactly one capture group
+
+    Returns:
+        Function mapping a body to its attribute dict
+    """
+    if not spec:
+        return lambda body: {}
+
+    scanner = re.compile(
+        "|".join(f"(?P<{key}>{pattern})" for key, pattern in spec.items())
+    )
+    converters = {
+        key: _ATTRIBUTE_CONVERTERS[key] for key in spec if key in _ATTRIBUTE_CONVERTERS
+    }
+
+    def extract(body: str) -> dict[str, Any]:
+        attrs = {}
+        for m in scanner.finditer(body):
+            # The named alternative closes last; its capture group follows it
+            if m.lastgroup not in attrs:
+                attrs[m.lastgroup] = m.group(m.lastindex + 1)
+        for key, convert in converters.items():
+            if key in attrs:
+                attrs[key] = convert(attrs[key])
+        return attrs
+
+    return extract
+
+
+_extract_ingress_rule = _attribute_extractor(_INGRESS_SPEC)
+
+
+def _parse_security_group_attributes(body: str) -> dict[str, Any]:
+    """Extract attributes of an aws_security_group body."""
+    attrs = {}
+    # Substring checks are far cheaper than a regex scan that finds nothing
+    if "ingress" not in body:
+        return attrs
+    # Extract ingress rules
+    ingress_rules = [
+        _extract_ingress_rule(ing_body)
+        for ing_body in _RE_INGRESS_BLOCK.findall(body)
+    ]
+    if ingress_rules:
+        attrs["ingress_rules"] = ingress_rules
+    return attrs
+
+
+# resource_type -> (ParsedTerraformConfig list field, attribute extractor)
+_RESOURCE_PARSERS: dict[str, tuple[str, Callable[[str], dict[str, Any]]]] = {
+    resource_type: (field_name, _attribute_extractor(spec))
+    for resource_type, (field_name, spec) in _RESOURCE_SPECS.items()
+}
+_RESOURCE_PARSERS["aws_security_group"] = (
+    "security_groups",
+    _parse_security_group_attributes,
+)
+
+
+def _count_condition(body: str) -> str | None:
+    """Return the condition of a ternary ``count = cond ? 1 : 0``, if any."""
+    # Most resources have no count at all; skip the regex for them
+    if "count" not in body:
+        return None
+    count_match = _RE_COUNT.search(body)
+    if not count_match:
+        return None
+
+    count_expr = count_match.group(1).strip()
+    # Detect ternary conditional: condition ? 1 : 0
+    if '?' in count_expr and ':' in count_expr:
+        # Extract condition (before the ?)
+        return count_expr.split('?')[0].strip()
+    return None
+
+
+def _iter_blocks(content: str, header_re: re.Pattern) -> Iterator[tuple[re.Match, str]]:
+    """
+    Yield (header match, body) for every block whose header ends in ``{``.
+
+    Bodies are delimited by counting braces, so nested blocks of any depth
+    (ingress rules, tags, lifecycle, ...) stay inside their parent block.
+    Braces inside quoted strings, comments and heredocs are not counted.
+
+    Args:
+        content: Terraform file content
+        header_re: Pattern matching a block header up to its opening brace
+
+    Yields:
+        Tuple of the header match and the text between the braces
+    """
+    pos = 0
+    while header := header_re.search(content, pos):
+        depth = 1
+        pos = header.end()
+        while depth:
+            for token in _BLOCK_TOKEN_RE.finditer(content, pos):
+                kind = token.lastgroup
+                if kind == "open":
+                    depth += 1
+                elif kind == "close":
+                    depth -= 1
+                    if depth == 0:
+                        break
+                elif kind == "heredoc":
+                    # Resume scanning after the line holding the closing marker
+                    end = re.compile(
+                        rf"^[ \t]*{token.group(kind)}[ \t]*$", re.MULTILINE
+                    ).search(content, token.end())
+                    if end is None:
+                        return
+                    pos = end.end()
+                    break
+            else:
+                # Unterminated block: nothing after it can be a complete block
+                return
+
+        yield header, content[header.end() : token.start()]
+        pos = token.end()
+
+
+def _iter_resource_blocks(content: str) -> Iterator[tuple[str, str, str]]:
+    """
+    Yield (resource_type, name, body) for every resource block in the content.
+
+    Args:
+        content: Terraform file content
+
+    Yields:
+        Tuple of resource type, resource name and the text between the braces
+    """
+    for header, body in _iter_blocks(content, _RESOURCE_HEADER_RE):
+        yield header.group("rtype"), header.group("rname"), body
+
+
+def _read_terraform_file(file_path: Path) -> str:
+    """
+    Read a Terraform file's content.
 
     Args:
         file_path: Path to the .tf file
 
     Returns:
-        ParsedTerraformConfig with extracted resources
+        File content
 
     Raises:
         FileNotFoundError: If file doesn't exist
-        ValueError: If file cannot be parsed
+        ValueError: If file cannot be read
     """
     if not file_path.exists():
         raise FileNotFoundError(f"Terraform file not found: {file_path}")
 
     try:
-        content = file_path.read_text(encoding="utf-8")
+        # Decode the raw bytes once; text mode would add a newline-translation
+        # pass that none of the patterns need
+        return file_path.read_bytes().decode("utf-8")
     except Exception as e:
         raise ValueError(f"Failed to read {file_path}: {e}")
 
-    config = ParsedTerraformConfig()
 
-    # Parse EC2 instances
-    ec2_pattern = r'resource\s+"aws_instance"\s+"([^"]+)"\s*\{([^}]+(?:\{[^}]*\}[^}]*)*)\}'
-    for match in re.finditer(ec2_pattern, content, re.DOTALL):
-        name = match.group(1)
-        body = match.group(2)
+def _iter_resources(
+    content: str, resolve: Callable[[TerraformResource], None] | None
+) -> Iterator[tuple[str, TerraformResource]]:
+    """
+    Yield (config field name, resource) for every supported resource block.
 
-        attrs = {}
-        # Extract instance_type (handle both quoted strings AND local references)
-        if m := re.search(r'instance_type\s*=\s*"([^"]+)"', body):
-            attrs["instance_type"] = m.group(1)
-        elif m := re.search(r'instance_type\s*=\s*(local\.\w+)', body):
-            attrs["instance_type"] = m.group(1)  # Will be resolved later
-        # Extract AMI
-        if m := re.search(r'ami\s*=\s*"([^"]+)"', body):
-            attrs["ami"] = m.group(1)
-        # Extract security groups
-        sg_matches = re.findall(r'vpc_security_group_ids\s*=\s*\[([^\]]+)\]', body)
-        if sg_matches:
-            attrs["security_groups"] = [
-                sg.strip().strip('"')
-                for sg in sg_matches[0].split(",")
-                if sg.strip()
-            ]
-        # Extract IAM instance profile
-        if m := re.search(r'iam_instance_profile\s*=\s*[^.]+\.([^.]+)\.name', body):
-            attrs["iam_role"] = m.group(1)
-
-        config.ec2_instances.append(
-            TerraformResource(
-                resource_type="aws_instance", name=name, attributes=attrs
-            )
-        )
+    Resource blocks are found with a single scan of the content; each block
+    body is handed to the attribute extractor for its type and checked for a
+    conditional ``count`` in the same pass.
 
-    # Parse security groups
-    sg_pattern = r'resource\s+"aws_security_group"\s+"([^"]+)"\s*\{([^}]+(?:\{[^}]*\}[^}]*)*)\}'
-    for match in re.finditer(sg_pattern, content, re.DOTALL):
-        name = match.group(1)
-        body = match.group(2)
+    Args:
+        content: Terraform file content
+        resolve: Resolver for the file's local.* references, if it has locals
 
-        attrs = {}
-        # Extract ingress rules
-        ingress_rules = []
-        for ing in re.finditer(
-            r'ingress\s*\{([^}]+)\}', body, re.DOTALL
-        ):
-            rule = {}
-            ing_body = ing.group(1)
-            if m := re.search(r'from_port\s*=\s*(\d+)', ing_body):
-                rule["from_port"] = int(m.group(1))
-            if m := re.search(r'to_port\s*=\s*(\d+)', ing_body):
-                rule["to_port"] = int(m.group(1))
-            if m := re.search(r'protocol\s*=\s*"([^"]+)"', ing_body):
-                rule["protocol"] = m.group(1)
-            ingress_rules.append(rule)
-        if ingress_rules:
-            attrs["ingress_rules"] = ingress_rules
-
-        config.security_groups.append(
-            TerraformResource(
-                resource_type="aws_security_group", name=name, attributes=attrs
-            )
+    Yields:
+        Tuple of the ParsedTerraformConfig list field and the parsed resource
+    """
+    for resource_type, name, body in _iter_resource_blocks(content):
+        handler = _RESOURCE_PARSERS.get(resource_type)
+        if handler is None:
+            continue
+        field_name, parse_attributes = handler
+
+        resource = TerraformResource(
+            # A handful of distinct types shared by every resource: intern them
+            # so each resource references one string and compares by identity
+            resource_type=sys.intern(resource_type),
+            name=name,
+            attributes=parse_attributes(body),
         )
+        if resource_type in _CONDITIONAL_TYPES:
+            condition = _count_condition(body)
+            if condition is not None:
+                resource.is_conditional = True
+                resource.condition = condition
 
-    # Parse ALBs
-    alb_pattern = r'resource\s+"aws_lb"\s+"([^"]+)"\s*\{([^}]+)\}'
-    for match in re.finditer(alb_pattern, content, re.DOTALL):
-        name = match.group(1)
-        body = match.group(2)
+        if resolve is not None:
+            resolve(resource)
 
-        attrs = {}
-        if m := re.search(r'load_balancer_type\s*=\s*"([^"]+)"', body):
-            attrs["type"] = m.group(1)
+        yield field_name, resource
 
-        config.albs.append(
-            TerraformResource(resource_type="aws_lb", name=name, attributes=attrs)
-        )
 
-    # Parse EIPs
-    eip_pattern = r'resource\s+"aws_eip"\s+"([^"]+)"\s*\{([^}]+)\}'
-    for match in re.finditer(eip_pattern, content, re.DOTALL):
-        name = match.group(1)
-        config.eips.append(
-            TerraformResource(resource_type="aws_eip", name=name, attributes={})
-        )
+def iter_terraform_file(file_path: Path) -> Iterator[tuple[str, TerraformResource]]:
+    """
+    Lazily parse a single Terraform file, one resource at a time.
 
-    # Parse Route53 records
-    r53_pattern = r'resource\s+"aws_route53_record"\s+"([^"]+)"\s*\{([^}]+)\}'
-    for match in re.finditer(r53_pattern, content, re.DOTALL):
-        name = match.group(1)
-        body = match.group(2)
+    Local references are resolved against the file's own locals block, as in
+    ``parse_terraform_file``, but no ParsedTerraformConfig is built, so
+    callers can append resources straight into their own collections. The
+    file is parsed afresh on every call; ``parse_directory`` keeps using the
+    memoized per-file configs instead, which also carry each file's locals.
 
-        attrs = {}
-        if m := re.search(r'type\s*=\s*"([^"]+)"', body):
-            attrs["record_type"] = m.group(1)
-        if m := re.search(r'name\s*=\s*"([^"]+)"', body):
-            attrs["domain"] = m.group(1)
-
-        config.route53_records.append(
-            TerraformResource(
-                resource_type="aws_route53_record", name=name, attributes=attrs
-            )
-        )
+    Args:
+        file_path: Path to the .tf file
 
-    # Parse Lambda functions
-    lambda_pattern = r'resource\s+"aws_lambda_function"\s+"([^"]+)"\s*\{([^}]+)\}'
-    for match in re.finditer(lambda_pattern, content, re.DOTALL):
-        name = match.group(1)
-        body = match.group(2)
+    Yields:
+        Tuple of the ParsedTerraformConfig list field name (e.g.
+        ``"ec2_instances"``) and the parsed resource
 
-        attrs = {}
-        if m := re.search(r'function_name\s*=\s*"([^"]+)"', body):
-            attrs["function_name"] = m.group(1)
-        if m := re.search(r'runtime\s*=\s*"([^"]+)"', body):
-            attrs["runtime"] = m.group(1)
-        if m := re.search(r'role\s*=\s*[^.]+\.([^.]+)\.arn', body):
-            attrs["iam_role"] = m.group(1)
-
-        config.lambda_functions.append(
-            TerraformResource(
-                resource_type="aws_lambda_function", name=name, attributes=attrs
-            )
-        )
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If file cannot be parsed
+    """
+    content = _read_terraform_file(file_path)
+    yield from _iter_resources(content, _local_resolver(parse_locals_block(content)))
 
-    # Parse CloudWatch Log Groups
-    cw_pattern = r'resource\s+"aws_cloudwatch_log_group"\s+"([^"]+)"\s*\{([^}]+)\}'
-    for match in re.finditer(cw_pattern, content, re.DOTALL):
-        name = match.group(1)
-        body = match.group(2)
 
-        attrs = {}
-        if m := re.search(r'name\s*=\s*"([^"]+)"', body):
-            attrs["log_group_name"] = m.group(1)
+def parse_terraform_file(file_path: Path) -> ParsedTerraformConfig:
+    """
+    Parse a single Terraform file and extract resource definitions.
 
-        config.cloudwatch_logs.append(
-            TerraformResource(
-                resource_type="aws_cloudwatch_log_group", name=name, attributes=attrs
-            )
-        )
+    Results are memoized on the file's path, mtime and size, so re-parsing an
+    unchanged file (directly or via ``parse_directory``) skips the regex work.
+    Each call still returns an independent copy.
 
-    # Parse IAM Roles
-    iam_role_pattern = r'resource\s+"aws_iam_role"\s+"([^"]+)"\s*\{([^}]+(?:\{[^}]*\}[^}]*)*)\}'
-    for match in re.finditer(iam_role_pattern, content, re.DOTALL):
-        name = match.group(1)
-        body = match.group(2)
+    Args:
+        file_path: Path to the .tf file
 
-        attrs = {}
-        if m := re.search(r'name\s*=\s*"([^"]+)"', body):
-            attrs["role_name"] = m.group(1)
+    Returns:
+        ParsedTerraformConfig with extracted resources
 
-        config.iam_roles.append(
-            TerraformResource(
-                resource_type="aws_iam_role", name=name, attributes=attrs
-            )
-        )
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If file cannot be parsed
+    """
+    if not file_path.exists():
+        raise FileNotFoundError(f"Terraform file not found: {file_path}")
 
-    # Parse IAM Policies
-    iam_policy_pattern = (
-        r'resource\s+"aws_iam_policy"\s+"([^"]+)"\s*\{([^}]+(?:\{[^}]*\}[^}]*)*)\}'
+    stat = file_path.stat()
+    return pickle.loads(
+        _parsed_file_bytes(str(file_path), stat.st_mtime_ns, stat.st_size)
     )
-    for match in re.finditer(iam_policy_pattern, content, re.DOTALL):
-        name = match.group(1)
-        body = match.group(2)
 
-        attrs = {}
-        if m := re.search(r'name\s*=\s*"([^"]+)"', body):
-            attrs["policy_name"] = m.group(1)
 
-        config.iam_policies.append(
-            TerraformResource(
-                resource_type="aws_iam_policy", name=name, attributes=attrs
-            )
-        )
+def _parse_terraform_file_uncached(file_path: Path) -> ParsedTerraformConfig:
+    """Read and parse a file without consulting the parse memos."""
+    return _parse_terraform_string_uncached(_read_terraform_file(file_path))
 
-    # Parse Target Groups
-    tg_pattern = r'resource\s+"aws_lb_target_group"\s+"([^"]+)"\s*\{([^}]+)\}'
-    for match in re.finditer(tg_pattern, content, re.DOTALL):
-        name = match.group(1)
-        body = match.group(2)
 
-        attrs = {}
-        if m := re.search(r'port\s*=\s*(\d+)', body):
-            attrs["port"] = int(m.group(1))
-        if m := re.search(r'protocol\s*=\s*"([^"]+)"', body):
-            attrs["protocol"] = m.group(1)
-
-        config.target_groups.append(
-            TerraformResource(
-                resource_type="aws_lb_target_group", name=name, attributes=attrs
-            )
-        )
+def parse_terraform_string(content: str) -> ParsedTerraformConfig:
+    """
+    Parse Terraform configuration text and extract resource definitions.
+
+    Same as ``parse_terraform_file`` for content that is already in memory.
+    Results are memoized on the content, and each call returns an
+    independent copy.
+
+    Args:
+        content: Terraform file content
 
-    # PHASE 1: Parse locals block FIRST
-    config.locals = parse_locals_block(content)
+    Returns:
+        ParsedTerraformConfig with extracted resources
+    """
+    return pickle.loads(_parsed_string_bytes(content))
 
-    # PHASE 2: Parse subscription filters
-    parse_subscription_filters(content, config)
 
-    # PHASE 3: Detect conditional resources and resolve variable references
-    detect_conditional_resources(content, config)
-    resolve_variable_references(config)
+def _parsed_string_bytes(content: str) -> bytes:
+    """Pickled parse of some Terraform content, memoized on its digest."""
+    key = hashlib.blake2b(content.encode(), digest_size=16).digest()
+    data = _PARSED_STRINGS.get(key)
+    if data is not None:
+        _PARSED_STRINGS.move_to_end(key)
+        return data
+
+    data = pickle.dumps(
+        _parse_terraform_string_uncached(content), protocol=pickle.HIGHEST_PROTOCOL
+    )
+    _PARSED_STRINGS[key] = data
+    while len(_PARSED_STRINGS) > _PARSED_STRINGS_MAX:
+        _PARSED_STRINGS.popitem(last=False)
+    return data
+
+
+def _parse_terraform_string_uncached(content: str) -> ParsedTerraformConfig:
+    """Parse Terraform content without consulting the parse memo."""
+    # Parse locals block first so references resolve as resources are built
+    config = ParsedTerraformConfig(locals=parse_locals_block(content))
+
+    for field_name, resource in _iter_resources(
+        content, _local_resolver(config.locals)
+    ):
+        getattr(config, field_name).append(resource)
 
     return config
 
@@ -291,130 +513,191 @@ def parse_locals_block(content: str) -> dict[str, str]:
     Returns:
         Dictionary mapping local variable names to their values
     """
+    # Only look inside locals {} blocks; name = "..." assignments in resource
+    # bodies (tags, record names, log group names) are not locals
     locals_dict = {}
+    if "locals" not in content:
+        return locals_dict
+    for _, body in _iter_blocks(content, _LOCALS_HEADER_RE):
+        # Parse simple string assignments: name = "value"
+        locals_dict.update(_RE_LOCAL_STRING.findall(body))
+
+        # Parse simple equals comparisons: name = something == "value"
+        # (store the whole expression for now)
+        locals_dict.update(
+            (name, f'{lhs} == "{value}"')
+            for name, lhs, value in _RE_LOCAL_EQUALITY.findall(body)
+        )
 
-    # Strategy: Search the entire file content for specific patterns
-    # This is more robust than trying to extract the locals block perfectly
+    return locals_dict
 
-    # Parse simple string assignments anywhere: name = "value"
-    for m in re.finditer(r'(\w+)\s*=\s*"([^"]+)"', content):
-        name = m.group(1)
-        value = m.group(2)
-        locals_dict[name] = value
 
-    # Parse simple equals comparisons: name = something == "value"
-    for m in re.finditer(r'(\w+)\s*=\s*(\S+)\s*==\s*"([^"]+)"', content):
-        name = m.group(1)
-        # Store the whole expression for now
-        locals_dict[name] = f'{m.group(2)} == "{m.group(3)}"'
+def _locals_reference_pattern(locals_dict: dict[str, str]) -> re.Pattern:
+    """
+    Compile one regex matching ``local.<name>`` for every known local.
 
-    return locals_dict
+    The trailing word boundary keeps ``local.size_large`` from being resolved
+    as ``local.size`` followed by ``_large``.
 
+    Args:
+        locals_dict: Parsed locals, keyed by variable name
 
-def parse_subscription_filters(content: str, config: ParsedTerraformConfig):
+    Returns:
+        Pattern whose first group is the referenced local's name
     """
-    Parse CloudWatch subscription filter resources.
+    names = "|".join(map(re.escape, locals_dict))
+    return re.compile(rf"local\.({names})\b")
+
+
+def _local_resolver(
+    locals_dict: dict[str, str],
+) -> Callable[[TerraformResource], None] | None:
+    """
+    Build a function resolving local.* references in one resource, in place.
+
+    All locals are substituted in a single regex pass per string rather than
+    one str.replace pass per local.
 
     Args:
-        content: Terraform file content
-        config: Config object to add subscription filters to
+        locals_dict: Parsed locals, keyed by variable name
+
+    Returns:
+        Resolver function, or None when there are no locals to substitute
     """
-    pattern = r'resource\s+"aws_cloudwatch_log_subscription_filter"\s+"([^"]+)"\s*\{([^}]+)\}'
+    if not locals_dict:
+        return None
+
+    pattern = _locals_reference_pattern(locals_dict)
+
+    def substitute(match: re.Match) -> str:
+        return locals_dict[match.group(1)]
+
+    def resolve(resource: TerraformResource) -> None:
+        # Iterate a snapshot and write back only the strings that changed,
+        # so the dict is never mutated while it is being iterated
+        updated = {}
+        for key, value in list(resource.attributes.items()):
+            # Most values reference no local; skip the regex for them
+            if isinstance(value, str) and "local." in value:
+                # Handles whole-value references and embedded ones (e.g., in
+                # interpolations) alike
+                resolved = pattern.sub(substitute, value)
+                if resolved != value:
+                    updated[key] = resolved
+        if updated:
+            resource.attributes.update(updated)
 
-    for match in re.finditer(pattern, content, re.DOTALL):
-        name = match.group(1)
-        body = match.group(2)
+        # Also resolve in condition strings
+        if "local." in resource.condition:
+            resource.condition = pattern.sub(substitute, resource.condition)
 
-        attrs = {}
+    return resolve
 
-        # Parse destination_arn (Lambda function reference)
-        if m := re.search(r'destination_arn\s*=\s*(\S+)', body):
-            attrs['destination_arn'] = m.group(1)
 
-        # Parse log_group_name (CloudWatch log group reference)
-        if m := re.search(r'log_group_name\s*=\s*(\S+)', body):
-            attrs['log_group_name'] = m.group(1)
+def resolve_variable_references(config: ParsedTerraformConfig):
+    """
+    Resolve local.variable_name references in resource attributes.
 
-        # Parse filter_pattern
-        if m := re.search(r'filter_pattern\s*=\s*"([^"]*)"', body):
-            attrs['filter_pattern'] = m.group(1)
+    Args:
+        config: Config object with locals and resources
+    """
+    resolve = _local_resolver(config.locals)
+    if resolve is None:
+        return
 
-        config.subscription_filters.append(
-            TerraformResource(
-                resource_type='aws_cloudwatch_log_subscription_filter',
-                name=name,
-                attributes=attrs
-            )
-        )
+    for resource in config.iter_all_resources():
+        resolve(resource)
 
 
-def detect_conditional_resources(content: str, config: ParsedTerraformConfig):
+def _tf_file_entries(directory_path: Path) -> list[os.DirEntry]:
     """
-    Detect resources with count conditionals and mark them.
+    List a directory's .tf files in a single scandir pass.
+
+    Matches ``directory_path.glob("*.tf")`` (hidden files excluded) but keeps
+    the DirEntry objects, whose cached stat results callers can reuse.
 
     Args:
-        content: Terraform file content
-        config: Config object with resources to check
+        directory_path: Path to directory containing .tf files
+
+    Returns:
+        DirEntry for every regular .tf file, in directory order
     """
-    # Pattern to match resource blocks with their full content
-    resource_pattern = r'resource\s+"([^"]+)"\s+"([^"]+)"\s*\{([^}]+(?:\{[^}]*\}[^}]*)*)\}'
+    with os.scandir(directory_path) as entries:
+        return [
+            entry
+            for entry in entries
+            if entry.name.endswith(".tf")
+            and not entry.name.startswith(".")
+            and entry.is_file()
+        ]
 
-    for match in re.finditer(resource_pattern, content, re.DOTALL):
-        resource_type = match.group(1)
-        resource_name = match.group(2)
-        body = match.group(3)
 
-        # Check for count parameter
-        count_match = re.search(r'count\s*=\s*(.+?)(?:\n|$)', body)
+def _memoized_file_bytes(key: tuple[str, int, int]) -> bytes | None:
+    """Look up a file's pickled parse by (path, mtime_ns, size), if memoized."""
+    data = _PARSED_FILES.get(key)
+    if data is not None:
+        _PARSED_FILES.move_to_end(key)
+    return data
 
-        if count_match:
-            count_expr = count_match.group(1).strip()
 
-            # Detect ternary conditional: condition ? 1 : 0
-            if '?' in count_expr and ':' in count_expr:
-                # Extract condition (before the ?)
-                condition = count_expr.split('?')[0].strip()
+def _remember_file_bytes(key: tuple[str, int, int], data: bytes) -> None:
+    """Memoize a file's pickled parse, evicting the least recently used."""
+    _PARSED_FILES[key] = data
+    _PARSED_FILES.move_to_end(key)
+    while len(_PARSED_FILES) > _PARSED_FILES_MAX:
+        _PARSED_FILES.popitem(last=False)
 
-                # Find the matching resource and mark it
-                for resource_list in [
-                    config.ec2_instances, config.albs, config.route53_records,
-                    config.lambda_functions, config.cloudwatch_logs, config.target_groups
-                ]:
-                    for resource in resource_list:
-                        if resource.resource_type == resource_type and resource.name == resource_name:
-                            resource.is_conditional = True
-                            resource.condition = condition
 
+def _parsed_file_bytes(path_str: str, mtime_ns: int, size: int) -> bytes:
+    """Pickled parse of one file, memoized on its path, mtime and size.
 
-def resolve_variable_references(config: ParsedTerraformConfig):
+    A touched but unchanged file misses here and hits the content memo.
     """
-    Resolve local.variable_name references in resource attributes.
+    key = (path_str, mtime_ns, size)
+    data = _memoized_file_bytes(key)
+    if data is None:
+        data = _parsed_string_bytes(_read_terraform_file(Path(path_str)))
+        _remember_file_bytes(key, data)
+    return data
+
+
+def _pickled_file_parse(path_str: str) -> bytes:
+    """Parse a file in a worker process and return the pickled result."""
+    return pickle.dumps(
+        _parse_terraform_file_uncached(Path(path_str)),
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
 
-    Args:
-        config: Config object with locals and resources
+
+def _file_key(entry: os.DirEntry) -> tuple[str, int, int]:
+    """Memo key of a .tf file: its path, mtime and size."""
+    stat = entry.stat()
+    return entry.path, stat.st_mtime_ns, stat.st_size
+
+
+def _load_parsed_file(
+    key: tuple[str, int, int], future: Future | None = None
+) -> ParsedTerraformConfig:
     """
-    # Get all resources
-    all_resources = config.get_all_resources()
+    Parse a file, reusing the previous result while it is unchanged on disk.
 
-    for resource in all_resources:
-        for key, value in resource.attributes.items():
-            if isinstance(value, str):
-                # Check if it's a local variable reference
-                if value.startswith('local.'):
-                    var_name = value.replace('local.', '')
-                    if var_name in config.locals:
-                        # Resolve the reference
-                        resource.attributes[key] = config.locals[var_name]
+    The memo holds pickled bytes, so every call returns an independent object
+    that callers are free to mutate (the merged lists and tier tags are).
 
-                # Also handle embedded local references (e.g., in interpolations)
-                for var_name, var_value in config.locals.items():
-                    value = value.replace(f'local.{var_name}', var_value)
-                    resource.attributes[key] = value
+    Args:
+        key: Memo key from ``_file_key``
+        future: Pending worker parse of the file, if it was sent to the pool
 
-        # Also resolve in condition strings
-        if resource.condition:
-            for var_name, var_value in config.locals.items():
-                resource.condition = resource.condition.replace(f'local.{var_name}', var_value)
+    Returns:
+        ParsedTerraformConfig with extracted resources
+    """
+    if future is None:
+        data = _parsed_file_bytes(*key)
+    else:
+        # Re-raises a worker's exception for parse_directory to report
+        data = future.result()
+        _remember_file_bytes(key, data)
+    return pickle.loads(data)
 
 
 def parse_directory(directory_path: Path) -> ParsedTerraformConfig:
@@ -431,18 +714,32 @@ def parse_directory(directory_path: Path) -> ParsedTerraformConfig:
         FileNotFoundError: If directory doesn't exist
         ValueError: If no .tf files found or parsing fails
     """
-    if not directory_path.exists() or not directory_path.is_dir():
-        raise FileNotFoundError(f"Directory not found: {directory_path}")
-
-    tf_files = list(directory_path.glob("*.tf"))
-    if not tf_files:
+    # scandir reports a missing directory itself, so no separate stat calls
+    try:
+        tf_entries = _tf_file_entries(directory_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise FileNotFoundError(f"Directory not found: {directory_path}") from None
+    if not tf_entries:
         raise ValueError(f"No .tf files found in {directory_path}")
 
     combined_config = ParsedTerraformConfig()
 
-    for tf_file in tf_files:
+    keys = [_file_key(entry) for entry in tf_entries]
+    misses = [key for key in keys if _memoized_file_bytes(key) is None]
+
+    futures = {}
+    if len(misses) >= _PARALLEL_PARSE_MIN_FILES:
+        # Regex parsing is CPU-bound, so fan the changed files out to processes;
+        # unchanged ones are still served from the memo
+        with ProcessPoolExecutor() as executor:
+            futures = {
+                key: executor.submit(_pickled_file_parse, key[0]) for key in misses
+            }
+    loaders = [partial(_load_parsed_file, key, futures.get(key)) for key in keys]
+
+    for entry, load in zip(tf_entries, loaders):
         try:
-            file_config = parse_terraform_file(tf_file)
+            file_config = load()
 
             # Merge resources
             combined_config.ec2_instances.extend(file_config.ec2_instances)
@@ -461,11 +758,117 @@ def parse_directory(directory_path: Path) -> ParsedTerraformConfig:
             combined_config.locals.update(file_config.locals)
 
         except Exception as e:
-            raise ValueError(f"Failed to parse {tf_file}: {e}")
+            raise ValueError(f"Failed to parse {entry.path}: {e}")
 
     return combined_config
 
 
+def _directory_hash(directory_path: Path) -> str:
+    """Hash the name, mtime and size of every .tf file in a directory.
+
+    Args:
+        directory_path: Path to directory containing .tf files
+
+    Returns:
+        str: Hex digest identifying the directory's current contents
+    """
+    digest = hashlib.sha256(_SOURCE_DIGEST.encode())
+    for entry in sorted(_tf_file_entries(directory_path), key=lambda e: e.name):
+        stat = entry.stat()
+        digest.update(f"{entry.name}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=16)
+def _parsed_directory_bytes(directory: str, directory_hash: str) -> bytes:
+    """Pickled parse of a directory, memoized on its absolute path and contents."""
+    return pickle.dumps(
+        _parse_directory_disk_cached(Path(directory), directory_hash),
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+
+
+def _is_private_cache_file(path: Path) -> bool:
+    """Whether a cache entry belongs to this user and nobody else can write it."""
+    stat = path.stat()
+    if hasattr(os, "getuid") and stat.st_uid != os.getuid():
+        return False
+    return not stat.st_mode & 0o022
+
+
+def _parse_directory_disk_cached(
+    directory_path: Path, directory_hash: str
+) -> ParsedTerraformConfig:
+    """Parse a directory through the on-disk cache in ``PARSE_CACHE_DIR``."""
+    cached_file = PARSE_CACHE_DIR / f"{directory_hash}.pkl"
+    # Only unpickle entries nobody else could have planted
+    if cached_file.exists() and _is_private_cache_file(cached_file):
+        try:
+            with open(cached_file, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            # Corrupt or incompatible cache entry: fall through and re-parse
+            pass
+
+    config = parse_directory(directory_path)
+
+    # Write to a temporary name first so concurrent runs never see a partial file
+    PARSE_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    tmp_file = cached_file.with_name(f"{cached_file.name}.{os.getpid()}.tmp")
+    with open(tmp_file, "wb") as f:
+        pickle.dump(config, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, cached_file)
+    _prune_parse_cache()
+
+    return config
+
+
+def _prune_parse_cache() -> None:
+    """Delete all but the ``_PARSE_CACHE_MAX_ENTRIES`` newest disk cache entries."""
+    entries = []
+    for entry in PARSE_CACHE_DIR.glob("*.pkl"):
+        try:
+            entries.append((entry.stat().st_mtime_ns, entry))
+        except OSError:
+            # Removed by a concurrent run since the glob
+            continue
+    entries.sort(reverse=True)
+    for _, stale in entries[_PARSE_CACHE_MAX_ENTRIES:]:
+        stale.unlink(missing_ok=True)
+
+
+def parse_directory_cached(directory_path: Path) -> ParsedTerraformConfig:
+    """
+    Parse all Terraform files in a directory, reusing earlier parses.
+
+    Repeated calls in one process are served from an in-memory memo keyed by
+    the directory's absolute path; across processes, parses are cached on disk
+    under ``PARSE_CACHE_DIR``. Both are keyed by each .tf file's name, mtime
+    and size, so editing any file (or adding/removing one) triggers a fresh
+    parse. Every call returns a new object, so callers may mutate the result.
+
+    Args:
+        directory_path: Path to directory containing .tf files
+
+    Returns:
+        ParsedTerraformConfig with all extracted resources
+
+    Raises:
+        FileNotFoundError: If directory doesn't exist
+        ValueError: If no .tf files found or parsing fails
+    """
+    directory_path = Path(directory_path)
+    if not directory_path.is_dir():
+        # Let parse_directory raise its usual error
+        return parse_directory(directory_path)
+
+    return pickle.loads(
+        _parsed_directory_bytes(
+            str(directory_path.resolve()), _directory_hash(directory_path)
+        )
+    )
+
+
 def parse_lablink_architecture(
     infrastructure_dir: Path,
     client_vm_dir: Path | None = None
@@ -490,7 +893,7 @@ def parse_lablink_architecture(
     infra_config.tier = "infrastructure"
 
     # Mark all resources as infrastructure tier
-    for resource in infra_config.get_all_resources():
+    for resource in infra_config.iter_all_resources():
         resource.tier = "infrastructure"
 
     # Parse client VM Terraform if provided
@@ -500,7 +903,7 @@ def parse_lablink_architecture(
         client_config.tier = "client_vm"
 
         # Mark all resources as client VM tier (runtime-provisioned)
-        for resource in client_config.get_all_resources():
+        for resource in client_config.iter_all_resources():
             resource.tier = "client_vm"
 
     return infra_config, client_config
\ No newline at end of file
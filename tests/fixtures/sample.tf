@@ -0,0 +1,56 @@
+resource "aws_instance" "test_instance" {
+  ami           = "ami-12345678"
+  instance_type = "t3.large"
+  vpc_security_group_ids = [aws_security_group.test_sg.id]
+  iam_instance_profile = aws_iam_instance_profile.test_profile.name
+
+  tags = {
+    Name = "test-server"
+  }
+}
+
+resource "aws_security_group" "test_sg" {
+  name        = "test-security-group"
+  description = "Test security group"
+
+  ingress {
+    from_port   = 80
+    to_port     = 80
+    protocol    = "tcp"
+    cidr_blocks = ["0.0.0.0/0"]
+  }
+
+  ingress {
+    from_port   = 443
+    to_port     = 443
+    protocol    = "tcp"
+    cidr_blocks = ["0.0.0.0/0"]
+  }
+}
+
+resource "aws_lb" "test_alb" {
+  name               = "test-alb"
+  load_balancer_type = "application"
+}
+
+resource "aws_lambda_function" "test_lambda" {
+  function_name = "test-function"
+  role          = aws_iam_role.test_role.arn
+  runtime       = "python3.11"
+  handler       = "lambda_function.lambda_handler"
+}
+
+resource "aws_cloudwatch_log_group" "test_logs" {
+  name = "/aws/lambda/test-function"
+  retention_in_days = 14
+}
+
+resource "aws_iam_role" "test_role" {
+  name = "test-lambda-role"
+}
+
+resource "aws_route53_record" "test_dns" {
+  zone_id = "Z1234567890"
+  name    = "test.example.com"
+  type    = "A"
+}
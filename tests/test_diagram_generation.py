@@ -1,15 +1,34 @@
 """Tests for diagram generation module."""
 
+import importlib.util
+import struct
 
 import pytest
 
+from src.diagram_gen import generator
 from src.diagram_gen.generator import (
     LabLinkDiagramBuilder,
+    generate_all,
     generate_detailed_diagram,
     generate_main_diagram,
     generate_network_flow_diagram,
 )
-from src.terraform_parser.parser import ParsedTerraformConfig, TerraformResource
+from src.terraform_parser.parser import (
+    ParsedTerraformConfig,
+    TerraformResource,
+)
+
+# The generator imports diagrams lazily, so only tests that build nodes need it
+requires_diagrams = pytest.mark.skipif(
+    importlib.util.find_spec("diagrams") is None,
+    reason="diagrams is not installed",
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_dot_source_cache(monkeypatch):
+    """Give each test an empty DOT-source memo, so no test sees another's renders."""
+    monkeypatch.setattr(LabLinkDiagramBuilder, "_DOT_SOURCE_CACHE", {})
 
 
 @pytest.fixture
@@ -99,6 +118,7 @@ def test_diagram_builder_initialization(sample_config):
     assert builder_no_iam.show_iam is False
 
 
+@requires_diagrams
 def test_generate_main_diagram(sample_config, tmp_path):
     """Test generating main architecture diagram."""
     output_path = tmp_path / "test-main"
@@ -110,6 +130,7 @@ def test_generate_main_diagram(sample_config, tmp_path):
     assert (tmp_path / "test-main.png").exists()
 
 
+@requires_diagrams
 def test_generate_detailed_diagram(sample_config, tmp_path):
     """Test generating detailed architecture diagram."""
     output_path = tmp_path / "test-detailed"
@@ -121,6 +142,7 @@ def test_generate_detailed_diagram(sample_config, tmp_path):
     assert (tmp_path / "test-detailed.png").exists()
 
 
+@requires_diagrams
 def test_generate_network_flow_diagram(sample_config, tmp_path):
     """Test generating network flow diagram."""
     output_path = tmp_path / "test-flow"
@@ -132,6 +154,7 @@ def test_generate_network_flow_diagram(sample_config, tmp_path):
     assert (tmp_path / "test-flow.png").exists()
 
 
+@requires_diagrams
 def test_generate_svg_format(sample_config, tmp_path):
     """Test generating diagram in SVG format."""
     output_path = tmp_path / "test-svg"
@@ -142,6 +165,7 @@ def test_generate_svg_format(sample_config, tmp_path):
     assert (tmp_path / "test-svg.svg").exists()
 
 
+@requires_diagrams
 def test_generate_with_custom_dpi(sample_config, tmp_path):
     """Test generating diagram with custom DPI."""
     output_path = tmp_path / "test-dpi"
@@ -152,6 +176,7 @@ def test_generate_with_custom_dpi(sample_config, tmp_path):
     assert (tmp_path / "test-dpi.png").exists()
 
 
+@requires_diagrams
 def test_diagram_with_minimal_config(tmp_path):
     """Test generating diagram with minimal configuration."""
     # Empty config
@@ -173,45 +198,192 @@ def test_diagram_with_minimal_config(tmp_path):
     assert (tmp_path / "test-minimal.png").exists()
 
 
+@requires_diagrams
 def test_create_compute_components(sample_config):
     """Test creating compute components."""
     builder = LabLinkDiagramBuilder(sample_config)
-    components = builder._create_compute_components()
+    ec2_nodes, lambda_nodes = builder._create_compute_components()
 
     # Should have EC2 and Lambda components
-    assert "ec2_allocator_server" in components
-    assert "lambda_log_processor" in components
+    assert len(ec2_nodes) == 1
+    assert len(lambda_nodes) == 1
 
 
+@requires_diagrams
 def test_create_network_components(sample_config):
     """Test creating network components."""
     builder = LabLinkDiagramBuilder(sample_config)
-    components = builder._create_network_components()
+    alb_nodes, route53_nodes = builder._create_network_components()
 
     # Should have ALB and Route53 components
-    assert "alb_allocator_alb" in components
-    assert "r53_allocator_dns" in components
+    assert len(alb_nodes) == 1
+    assert len(route53_nodes) == 1
 
 
+@requires_diagrams
 def test_create_observability_components(sample_config):
     """Test creating observability components."""
     builder = LabLinkDiagramBuilder(sample_config)
-    components = builder._create_observability_components()
+    cw_nodes = builder._create_observability_components()
 
     # Should have CloudWatch components
-    assert "cw_client_logs" in components
+    assert len(cw_nodes) == 1
 
 
+@requires_diagrams
 def test_create_iam_components(sample_config):
     """Test creating IAM components."""
     builder = LabLinkDiagramBuilder(sample_config, show_iam=True)
-    components = builder._create_iam_components()
+    iam_nodes = builder._create_iam_components()
 
     # Should have IAM role
-    assert "iam_instance_role" in components
+    assert len(iam_nodes) == 1
 
     # Test with IAM disabled
     builder_no_iam = LabLinkDiagramBuilder(sample_config, show_iam=False)
-    components_no_iam = builder_no_iam._create_iam_components()
+    iam_nodes_no_iam = builder_no_iam._create_iam_components()
+
+    assert len(iam_nodes_no_iam) == 0
+
+
+def test_nodes_or_placeholder_skips_fallback_when_parsed():
+    """Test that the placeholder node is only built when no parsed nodes exist."""
+
+    def fail_if_called(label):
+        raise AssertionError(f"placeholder {label!r} should not be constructed")
+
+    parsed = [object()]
+    result = LabLinkDiagramBuilder._nodes_or_placeholder(
+        parsed, fail_if_called, "DNS (Optional)"
+    )
+
+    assert result is parsed
+    assert LabLinkDiagramBuilder._nodes_or_placeholder([], str, "DNS") == ["DNS"]
+
+
+@requires_diagrams
+def test_generate_reuses_cached_render(sample_config, tmp_path, monkeypatch):
+    """Test that an identical second render is served from the diagram cache."""
+    monkeypatch.setattr(generator, "DIAGRAM_CACHE_DIR", tmp_path / "cache")
+
+    generate_main_diagram(
+        sample_config, tmp_path / "first", format="svg", use_cache=True
+    )
+
+    def fail_build(*args, **kwargs):
+        raise AssertionError("cache hit should not rebuild the diagram")
+
+    monkeypatch.setattr(LabLinkDiagramBuilder, "build_main_diagram", fail_build)
+    generate_main_diagram(
+        sample_config, tmp_path / "second", format="svg", use_cache=True
+    )
+
+    assert (tmp_path / "second.svg").read_bytes() == (
+        tmp_path / "first.svg"
+    ).read_bytes()
+
+
+@requires_diagrams
+def test_count_parsed_nodes(sample_config):
+    """Test counting parsed nodes used to pick the detailed-diagram layout."""
+    builder = LabLinkDiagramBuilder(sample_config)
+    assert builder._parsed_node_count == 6  # EC2, Lambda, ALB, R53, CW, IAM
+
+    builder_no_iam = LabLinkDiagramBuilder(sample_config, show_iam=False)
+    assert builder_no_iam._parsed_node_count == 5
+
+
+@requires_diagrams
+def test_generate_all(sample_config, tmp_path):
+    """Test generating the three core diagrams concurrently."""
+    paths = generate_all(sample_config, tmp_path, format="png", dpi=150)
+
+    assert [p.name for p in paths] == [
+        "lablink-architecture.png",
+        "lablink-architecture-detailed.png",
+        "lablink-network-flow.png",
+    ]
+    assert all(p.exists() for p in paths)
+
 
-    assert len(components_no_iam) == 0
\ No newline at end of file
+@requires_diagrams
+def test_large_config_is_summarized(sample_config):
+    """Test that configs over the node budget are cut down per resource type."""
+    sample_config.ec2_instances.extend(
+        TerraformResource(
+            resource_type="aws_instance",
+            name=f"worker_{i}",
+            attributes={"instance_type": "t3.large"},
+        )
+        for i in range(250)
+    )
+    builder = LabLinkDiagramBuilder(sample_config, max_nodes=200)
+
+    keep = LabLinkDiagramBuilder.SUMMARY_NODES_PER_TYPE
+    assert len(builder._specs["ec2"]) == keep + 1
+    assert builder._specs["ec2"][-1][2] == f"+{251 - keep} more"
+    # Types under the per-type cap are left alone
+    assert len(builder._specs["lambda"]) == 1
+
+
+@requires_diagrams
+def test_network_flow_reuses_dot_source(sample_config, tmp_path, monkeypatch):
+    """Test that a config-independent diagram is re-rendered from cached DOT."""
+    builder = LabLinkDiagramBuilder(sample_config)
+    builder.build_network_flow_diagram(tmp_path / "first", format="svg")
+
+    def fail_diagram(*args, **kwargs):
+        raise AssertionError("cached DOT source should skip Diagram construction")
+
+    monkeypatch.setattr("diagrams.Diagram", fail_diagram)
+    builder.build_network_flow_diagram(tmp_path / "second", format="svg")
+
+    assert (tmp_path / "second.svg").exists()
+
+
+@requires_diagrams
+def test_preferred_indices_prefer_known_names(sample_config):
+    """Test that the allocator and DNS record are found by name, not position."""
+    sample_config.ec2_instances.insert(
+        0,
+        TerraformResource(
+            resource_type="aws_instance",
+            name="bastion",
+            attributes={"instance_type": "t3.micro"},
+        ),
+    )
+    builder = LabLinkDiagramBuilder(sample_config)
+    assert builder._preferred_indices == {"ec2": 1, "r53": 0}
+
+    empty_builder = LabLinkDiagramBuilder(ParsedTerraformConfig())
+    assert empty_builder._preferred_indices == {"ec2": 0, "r53": 0}
+
+
+def _png_size(path):
+    """Width and height of a PNG, read from its IHDR header."""
+    with open(path, "rb") as f:
+        header = f.read(24)
+    return struct.unpack(">II", header[16:24])
+
+
+@requires_diagrams
+@pytest.mark.skipif(generator.cairosvg is None, reason="cairosvg is not installed")
+def test_cairosvg_png_matches_graphviz_png_size(sample_config, tmp_path, monkeypatch):
+    """Test that SVG rasterization keeps the pixel size Graphviz gives at that dpi."""
+    builder = LabLinkDiagramBuilder(sample_config)
+    generator._build_diagram(
+        builder, "build_main_diagram", tmp_path / "cairo", "png", dpi=150
+    )
+
+    monkeypatch.setattr(generator, "cairosvg", None)
+    generator._build_diagram(
+        builder, "build_main_diagram", tmp_path / "graphviz", "png", dpi=150
+    )
+
+    cairo_size = _png_size(tmp_path / "cairo.png")
+    graphviz_size = _png_size(tmp_path / "graphviz.png")
+    # Allow for rounding of the page size between the two rasterizers
+    assert all(abs(a - b) <= 2 for a, b in zip(cairo_size, graphviz_size)), (
+        cairo_size,
+        graphviz_size,
+    )
@@ -1,102 +1,195 @@
 """Tests for QR code generation."""
 
+import hashlib
+import importlib.util
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from pathlib import Path
-from PIL import Image
 import qrcode
 
 
-@pytest.fixture
-def qr_output_dir():
-    """Get the QR code output directory."""
-    return Path("figures/main")
-
-
-@pytest.fixture
-def expected_qr_codes():
-    """Expected QR code files and their URLs."""
-    return {
-        "qr_lablink.png": "https://github.com/talmolab/lablink",
-        "qr_lablink-template.png": "https://github.com/talmolab/lablink-template",
-    }
-
-
-def test_qr_code_files_exist(qr_output_dir, expected_qr_codes):
+# PNG IHDR color type -> PIL mode name (grayscale depends on bit depth)
+_PNG_COLOR_MODES = {0: "L", 2: "RGB", 3: "P", 4: "LA", 6: "RGBA"}
+
+
+def _png_info(file_path):
+    """Read a PNG's width, height and PIL mode name from its IHDR header.
+
+    Only the first 33 bytes (signature plus IHDR chunk) are read, unbuffered,
+    so no image decoder is involved.
+    """
+    with open(file_path, "rb", buffering=0) as f:
+        header = f.read(33)
+    assert header[:8] == b"\x89PNG\r\n\x1a\n", f"{file_path} is not a PNG"
+    assert header[12:16] == b"IHDR", f"{file_path} has no IHDR chunk"
+    width, height = struct.unpack(">II", header[16:24])
+    bit_depth, color_type = header[24], header[25]
+    if color_type == 0 and bit_depth == 1:
+        mode = "1"
+    else:
+        mode = _PNG_COLOR_MODES.get(color_type)
+    return width, height, mode
+
+
+@pytest.fixture(scope="session")
+def qr_dir_index(qr_output_dir):
+    """Directory entries of the QR output directory, listed once per session.
+
+    DirEntry caches its stat result, so size checks cost at most one stat
+    call per file.
+    """
+    with os.scandir(qr_output_dir) as entries:
+        return {entry.name: entry for entry in entries}
+
+
+# Expected QR code files and their URLs
+_QR_CODES = {
+    "qr_lablink.png": "https://github.com/talmolab/lablink",
+    "qr_lablink-template.png": "https://github.com/talmolab/lablink-template",
+}
+
+# Parameters used by scripts/plotting/generate_qr_codes.py
+_QR_BOX_SIZE = 20
+_QR_BORDER = 2
+
+_QR_SCRIPT = Path(__file__).parent.parent / "scripts/plotting/generate_qr_codes.py"
+# Committed figures; tests check these whenever they are all present
+_QR_FIGURES_DIR = Path("figures/main")
+# pytest cache key holding the digest of the script that made the cached figures
+_QR_CACHE_KEY = "qr_codes/script_digest"
+
+
+def _qr_files_present(directory):
+    """Whether every expected QR PNG and PDF exists in a directory."""
+    return all(
+        (directory / name).exists() and (directory / name).with_suffix(".pdf").exists()
+        for name in _QR_CODES
+    )
+
+
+def _regenerate_qr_codes(output_dir):
+    """Run generate_qr_codes.py's own functions, writing into output_dir."""
+    spec = importlib.util.spec_from_file_location("generate_qr_codes", _QR_SCRIPT)
+    script = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(script)
+
+    def render_png(item):
+        repo_name, url = item
+        png_path = output_dir / f"qr_{repo_name}.png"
+        script.generate_qr_code(url, png_path)
+        return png_path
+
+    # PNG encoding releases the GIL in zlib, so the codes render concurrently;
+    # the PDFs go through pyplot's global figure state and stay sequential
+    with ThreadPoolExecutor(max_workers=min(4, len(script.REPOS))) as executor:
+        png_paths = list(executor.map(render_png, script.REPOS.items()))
+    for png_path in png_paths:
+        script.generate_pdf_from_png(png_path, png_path.with_suffix(".pdf"))
+
+
+@pytest.fixture(scope="session")
+def qr_output_dir(request):
+    """Directory holding the QR figures under test.
+
+    The committed figures are used when they are all present; tests never
+    write to them. Otherwise the script renders the figures into pytest's
+    cache directory, once per change to the script's source.
+    """
+    if _qr_files_present(_QR_FIGURES_DIR):
+        return _QR_FIGURES_DIR
+
+    # The PDF step needs matplotlib, which only the figure environment has
+    if importlib.util.find_spec("matplotlib") is None:
+        pytest.skip("matplotlib is needed to regenerate the missing QR figures")
+
+    output_dir = request.config.cache.mkdir("qr_codes")
+    digest = hashlib.sha256(_QR_SCRIPT.read_bytes()).hexdigest()
+    if (
+        request.config.cache.get(_QR_CACHE_KEY, None) != digest
+        or not _qr_files_present(output_dir)
+    ):
+        _regenerate_qr_codes(output_dir)
+        request.config.cache.set(_QR_CACHE_KEY, digest)
+    return output_dir
+
+
+# One test item per QR code, so a failure names the file it concerns. The
+# PDF name is derived once here rather than in every test.
+each_qr_code = pytest.mark.parametrize(
+    "filename,pdf_filename,url",
+    [(name, name.replace(".png", ".pdf"), url) for name, url in _QR_CODES.items()],
+    ids=list(_QR_CODES),
+)
+
+
+@each_qr_code
+def test_qr_code_files_exist(qr_dir_index, filename, pdf_filename, url):
     """Test that QR code PNG files were generated."""
-    for filename in expected_qr_codes.keys():
-        file_path = qr_output_dir / filename
-        assert file_path.exists(), f"QR code file {filename} not found"
+    assert filename in qr_dir_index, f"QR code file {filename} not found"
 
 
-def test_qr_code_pdfs_exist(qr_output_dir, expected_qr_codes):
+@each_qr_code
+def test_qr_code_pdfs_exist(qr_dir_index, filename, pdf_filename, url):
     """Test that QR code PDF files were generated."""
-    for filename in expected_qr_codes.keys():
-        pdf_filename = filename.replace('.png', '.pdf')
-        pdf_path = qr_output_dir / pdf_filename
-        assert pdf_path.exists(), f"QR code PDF {pdf_filename} not found"
+    assert pdf_filename in qr_dir_index, f"QR code PDF {pdf_filename} not found"
 
 
-def test_qr_code_dimensions(qr_output_dir, expected_qr_codes):
+@each_qr_code
+def test_qr_code_dimensions(qr_output_dir, filename, pdf_filename, url):
     """Test that QR codes have expected dimensions."""
-    for filename in expected_qr_codes.keys():
-        file_path = qr_output_dir / filename
-        img = Image.open(file_path)
+    width, height, _ = _png_info(qr_output_dir / filename)
 
-        # QR codes should be at least 100x100 pixels
-        assert img.size[0] >= 100, f"{filename} width too small"
-        assert img.size[1] >= 100, f"{filename} height too small"
+    # QR codes should be at least 100x100 pixels
+    assert width >= 100, f"{filename} width too small"
+    assert height >= 100, f"{filename} height too small"
 
-        # QR codes should be square
-        assert img.size[0] == img.size[1], f"{filename} is not square"
+    # QR codes should be square
+    assert width == height, f"{filename} is not square"
 
 
-def test_qr_code_format(qr_output_dir, expected_qr_codes):
+@each_qr_code
+def test_qr_code_format(qr_output_dir, filename, pdf_filename, url):
     """Test that QR codes are valid images."""
-    for filename in expected_qr_codes.keys():
-        file_path = qr_output_dir / filename
-        img = Image.open(file_path)
-
-        # Should be a valid image mode
-        assert img.mode in ['1', 'L', 'RGB', 'RGBA'], f"{filename} has invalid image mode"
-
-
-def test_qr_code_generation_consistency(expected_qr_codes):
-    """Test that regenerating QR codes produces consistent results."""
-    for url in expected_qr_codes.values():
-        qr1 = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_H,
-            box_size=20,
-            border=2,
-        )
-        qr1.add_data(url)
-        qr1.make(fit=True)
-        img1 = qr1.make_image(fill_color="black", back_color="white")
-
-        qr2 = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_H,
-            box_size=20,
-            border=2,
-        )
-        qr2.add_data(url)
-        qr2.make(fit=True)
-        img2 = qr2.make_image(fill_color="black", back_color="white")
-
-        # Same dimensions
-        assert img1.size == img2.size, f"Inconsistent QR code size for {url}"
-
-
-def test_qr_code_file_sizes(qr_output_dir, expected_qr_codes):
+    _, _, mode = _png_info(qr_output_dir / filename)
+
+    # Should be a valid image mode
+    assert mode in ['1', 'L', 'RGB', 'RGBA'], f"{filename} has invalid image mode"
+
+
+@each_qr_code
+def test_qr_code_generation_consistency(qr_output_dir, filename, pdf_filename, url):
+    """Test that regenerating a QR code matches the saved image's size."""
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_H,
+        box_size=_QR_BOX_SIZE,
+        border=_QR_BORDER,
+        # The mask only changes module colors, not size; fixing it skips the
+        # search over all eight masks
+        mask_pattern=0,
+    )
+    qr.add_data(url)
+    qr.make(fit=True)
+
+    # The rendered size follows from the module count, so skip rendering
+    expected_size = (qr.modules_count + 2 * _QR_BORDER) * _QR_BOX_SIZE
+    width, height, _ = _png_info(qr_output_dir / filename)
+    assert (width, height) == (expected_size, expected_size), (
+        f"Inconsistent QR code size for {url}"
+    )
+
+
+@each_qr_code
+def test_qr_code_file_sizes(qr_dir_index, filename, pdf_filename, url):
     """Test that QR code files have reasonable sizes."""
-    for filename in expected_qr_codes.keys():
-        file_path = qr_output_dir / filename
-        file_size = file_path.stat().st_size
+    file_size = qr_dir_index[filename].stat().st_size
 
-        # PNG should be between 100 bytes and 100KB
-        assert 100 < file_size < 100_000, f"{filename} has unexpected file size: {file_size}"
+    # PNG should be between 100 bytes and 100KB
+    assert 100 < file_size < 100_000, f"{filename} has unexpected file size: {file_size}"
 
-        # PDF should exist and be larger than 100 bytes
-        pdf_path = qr_output_dir / filename.replace('.png', '.pdf')
-        pdf_size = pdf_path.stat().st_size
-        assert pdf_size > 100, f"PDF {pdf_path.name} is too small: {pdf_size}"
+    # PDF should exist and be larger than 100 bytes
+    pdf_size = qr_dir_index[pdf_filename].stat().st_size
+    assert pdf_size > 100, f"PDF {pdf_filename} is too small: {pdf_size}"
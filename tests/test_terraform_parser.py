@@ -1,214 +1,373 @@
 """Tests for Terraform parser module."""
 
+import os
 from pathlib import Path
 
 import pytest
 
+from src.terraform_parser import parser
 from src.terraform_parser.parser import (
+    ParsedTerraformConfig,
+    iter_terraform_file,
     parse_directory,
+    parse_directory_cached,
     parse_terraform_file,
+    parse_terraform_string,
 )
 
+# Sample Terraform configuration shared by the parser tests
+SAMPLE_TF = Path(__file__).parent / "fixtures" / "sample.tf"
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def sample_terraform_content():
     """Sample Terraform configuration content."""
-    return '''
-resource "aws_instance" "test_instance" {
-  ami           = "ami-12345678"
-  instance_type = "t3.large"
-  vpc_security_group_ids = [aws_security_group.test_sg.id]
-  iam_instance_profile = aws_iam_instance_profile.test_profile.name
+    return SAMPLE_TF.read_bytes().decode()
+
+
+@pytest.fixture(scope="session")
+def parsed_sample_config(sample_terraform_content):
+    """Sample configuration, parsed once per test session.
+
+    Shared across tests, so tests must not mutate it.
+    """
+    return parse_terraform_string(sample_terraform_content)
+
+
+def _lookup(obj, dotted_path):
+    """Follow a dotted path through attributes, dict keys and list indices."""
+    for part in dotted_path.split("."):
+        if isinstance(obj, dict):
+            obj = obj[part]
+        elif isinstance(obj, list):
+            obj = obj[int(part)]
+        else:
+            obj = getattr(obj, part)
+    return obj
+
+
+@pytest.mark.parametrize(
+    "attr,checks",
+    [
+        (
+            "ec2_instances",
+            {
+                "name": "test_instance",
+                "attributes.instance_type": "t3.large",
+                "attributes.ami": "ami-12345678",
+            },
+        ),
+        (
+            "security_groups",
+            {
+                "name": "test_sg",
+                "attributes.ingress_rules": [
+                    {"from_port": 80, "to_port": 80, "protocol": "tcp"},
+                    {"from_port": 443, "to_port": 443, "protocol": "tcp"},
+                ],
+            },
+        ),
+        ("albs", {"name": "test_alb", "attributes.type": "application"}),
+        (
+            "lambda_functions",
+            {
+                "name": "test_lambda",
+                "attributes.function_name": "test-function",
+                "attributes.runtime": "python3.11",
+            },
+        ),
+        (
+            "cloudwatch_logs",
+            {
+                "name": "test_logs",
+                "attributes.log_group_name": "/aws/lambda/test-function",
+            },
+        ),
+        (
+            "iam_roles",
+            {"name": "test_role", "attributes.role_name": "test-lambda-role"},
+        ),
+        (
+            "route53_records",
+            {
+                "name": "test_dns",
+                "attributes.domain": "test.example.com",
+                "attributes.record_type": "A",
+            },
+        ),
+    ],
+)
+def test_parse_resource_type(parsed_sample_config, attr, checks):
+    """Test parsing each resource type from the sample configuration."""
+    resources = getattr(parsed_sample_config, attr)
 
-  tags = {
-    Name = "test-server"
-  }
-}
+    assert len(resources) == 1
+    for path, expected in checks.items():
+        assert _lookup(resources[0], path) == expected, path
 
-resource "aws_security_group" "test_sg" {
-  name        = "test-security-group"
-  description = "Test security group"
 
-  ingress {
-    from_port   = 80
-    to_port     = 80
-    protocol    = "tcp"
-    cidr_blocks = ["0.0.0.0/0"]
-  }
+def test_parse_missing_file():
+    """Test error handling for missing files."""
+    with pytest.raises(FileNotFoundError):
+        parse_terraform_file(Path("/nonexistent/file.tf"))
+
+
+def test_parse_directory(tmp_path, sample_terraform_content):
+    """Test parsing multiple Terraform files in a directory."""
+    # Create multiple .tf files
+    (tmp_path / "main.tf").write_text(sample_terraform_content)
+    (tmp_path / "alb.tf").write_text(
+        'resource "aws_lb" "another_alb" { name = "alb2" }'
+    )
+
+    config = parse_directory(tmp_path)
+
+    # Should have resources from both files
+    assert len(config.ec2_instances) == 1
+    assert len(config.albs) == 2  # One from main.tf, one from alb.tf
+
+
+def test_parse_directory_no_tf_files(tmp_path):
+    """Test error handling when directory has no .tf files."""
+    with pytest.raises(ValueError, match="No .tf files found"):
+        parse_directory(tmp_path)
+
+
+def test_parse_directory_missing_directory():
+    """Test error handling for missing directory."""
+    with pytest.raises(FileNotFoundError):
+        parse_directory(Path("/nonexistent/directory"))
+
+
+def test_get_all_resources(parsed_sample_config):
+    """Test getting all resources as a flat list."""
+    config = parsed_sample_config
+    all_resources = config.get_all_resources()
+
+    # Should have all resource types
+    assert len(all_resources) == 7  # EC2, SG, ALB, Lambda, CW, IAM, Route53
+    assert list(config.iter_all_resources()) == all_resources
+
+
+def test_parse_directory_cached(tmp_path, sample_terraform_content, monkeypatch):
+    """Test that an unchanged directory is served from the memo and disk cache."""
+    monkeypatch.setattr(parser, "PARSE_CACHE_DIR", tmp_path / "cache")
+    tf_dir = tmp_path / "tf"
+    tf_dir.mkdir()
+    (tf_dir / "main.tf").write_text(sample_terraform_content)
 
-  ingress {
-    from_port   = 443
-    to_port     = 443
-    protocol    = "tcp"
-    cidr_blocks = ["0.0.0.0/0"]
+    first = parse_directory_cached(tf_dir)
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("cache hit should not re-parse the directory")
+
+    monkeypatch.setattr(parser, "parse_directory", fail_parse)
+    second = parse_directory_cached(tf_dir)
+
+    # A new process has an empty memo and must load from disk
+    parser._parsed_directory_bytes.cache_clear()
+    third = parse_directory_cached(tf_dir)
+
+    assert second == first
+    assert third == first
+    assert second is not first
+
+
+def test_parse_directory_cached_prunes_old_entries(
+    tmp_path, sample_terraform_content, monkeypatch
+):
+    """Test that writing a disk cache entry keeps only the newest ones."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(parser, "PARSE_CACHE_DIR", cache_dir)
+    monkeypatch.setattr(parser, "_PARSE_CACHE_MAX_ENTRIES", 2)
+    tf_file = tmp_path / "tf" / "main.tf"
+    tf_file.parent.mkdir()
+
+    # Each edit changes the directory hash, so each parse writes a new entry
+    for i in range(4):
+        tf_file.write_text(sample_terraform_content + f"\n# revision {i}\n")
+        os.utime(tf_file, ns=(i * 10**9, i * 10**9))
+        parse_directory_cached(tf_file.parent)
+
+    assert len(list(cache_dir.glob("*.pkl"))) == 2
+
+
+def test_parse_deeply_nested_block():
+    """Test that attributes after multi-level nested blocks are still found."""
+    config = parse_terraform_string('''
+resource "aws_lambda_function" "nested" {
+  environment {
+    variables = {
+      LEVEL = "two"
+    }
   }
+  function_name = "after-nesting"
 }
 
-resource "aws_lb" "test_alb" {
-  name               = "test-alb"
+resource "aws_lb" "next_alb" {
   load_balancer_type = "application"
 }
+''')
 
-resource "aws_lambda_function" "test_lambda" {
-  function_name = "test-function"
-  role          = aws_iam_role.test_role.arn
-  runtime       = "python3.11"
-  handler       = "lambda_function.lambda_handler"
-}
+    assert config.lambda_functions[0].attributes["function_name"] == "after-nesting"
+    assert [alb.name for alb in config.albs] == ["next_alb"]
 
-resource "aws_cloudwatch_log_group" "test_logs" {
-  name = "/aws/lambda/test-function"
-  retention_in_days = 14
-}
 
-resource "aws_iam_role" "test_role" {
-  name = "test-lambda-role"
+def test_braces_in_strings_comments_and_heredocs():
+    """Test that braces inside strings, comments and heredocs are not counted."""
+    config = parse_terraform_string('''
+resource "aws_instance" "braces" {
+  user_data = <<-EOF
+    echo "}" {
+  EOF
+  tags = { Name = "closing}" } # stray }
+  /* { */
+  instance_type = "t3.large"
 }
 
-resource "aws_route53_record" "test_dns" {
-  zone_id = "Z1234567890"
-  name    = "test.example.com"
-  type    = "A"
+resource "aws_lb" "next_alb" {
+  load_balancer_type = "application"
 }
-'''
-
+''')
 
-def test_parse_ec2_instance(tmp_path, sample_terraform_content):
-    """Test parsing EC2 instance resources."""
-    tf_file = tmp_path / "main.tf"
-    tf_file.write_text(sample_terraform_content)
+    assert config.ec2_instances[0].attributes["instance_type"] == "t3.large"
+    assert [alb.name for alb in config.albs] == ["next_alb"]
 
-    config = parse_terraform_file(tf_file)
 
-    assert len(config.ec2_instances) == 1
-    ec2 = config.ec2_instances[0]
-    assert ec2.name == "test_instance"
-    assert ec2.attributes["instance_type"] == "t3.large"
-    assert ec2.attributes["ami"] == "ami-12345678"
+def test_parse_directory_in_parallel(tmp_path, sample_terraform_content, monkeypatch):
+    """Test that the process-pool path merges the same resources as the serial one."""
+    (tmp_path / "main.tf").write_text(sample_terraform_content)
+    (tmp_path / "alb.tf").write_text(
+        'resource "aws_lb" "another_alb" { name = "alb2" }'
+    )
+    serial = parse_directory(tmp_path)
 
+    # Empty the per-file memo so every file goes to the pool
+    monkeypatch.setattr(parser, "_PARSED_FILES", type(parser._PARSED_FILES)())
+    monkeypatch.setattr(parser, "_PARALLEL_PARSE_MIN_FILES", 1)
+    parallel = parse_directory(tmp_path)
 
-def test_parse_security_group(tmp_path, sample_terraform_content):
-    """Test parsing security group resources."""
-    tf_file = tmp_path / "main.tf"
-    tf_file.write_text(sample_terraform_content)
+    assert parallel == serial
+    assert len(parser._PARSED_FILES) == 2
 
-    config = parse_terraform_file(tf_file)
 
-    assert len(config.security_groups) == 1
-    sg = config.security_groups[0]
-    assert sg.name == "test_sg"
-    assert len(sg.attributes["ingress_rules"]) == 2
-    assert sg.attributes["ingress_rules"][0]["from_port"] == 80
-    assert sg.attributes["ingress_rules"][1]["from_port"] == 443
+def test_parse_directory_in_parallel_reuses_unchanged_files(
+    tmp_path, sample_terraform_content, monkeypatch
+):
+    """Test that only changed files are sent to the process pool."""
+    monkeypatch.setattr(parser, "_PARALLEL_PARSE_MIN_FILES", 1)
+    (tmp_path / "main.tf").write_text(sample_terraform_content)
+    first = parse_directory(tmp_path)
 
+    def fail_pool(*args, **kwargs):
+        raise AssertionError("unchanged files should not be sent to the pool")
 
-def test_parse_alb(tmp_path, sample_terraform_content):
-    """Test parsing ALB resources."""
-    tf_file = tmp_path / "main.tf"
-    tf_file.write_text(sample_terraform_content)
+    monkeypatch.setattr(parser, "ProcessPoolExecutor", fail_pool)
+    second = parse_directory(tmp_path)
 
-    config = parse_terraform_file(tf_file)
+    assert second == first
 
-    assert len(config.albs) == 1
-    alb = config.albs[0]
-    assert alb.name == "test_alb"
-    assert alb.attributes["type"] == "application"
 
+def test_resolve_local_references():
+    """Test that local.* references resolve, including names sharing a prefix."""
+    config = parse_terraform_string('''
+locals {
+  size       = "t3.micro"
+  size_large = "t3.large"
+}
 
-def test_parse_lambda(tmp_path, sample_terraform_content):
-    """Test parsing Lambda function resources."""
-    tf_file = tmp_path / "main.tf"
-    tf_file.write_text(sample_terraform_content)
+resource "aws_instance" "small" {
+  instance_type = local.size
+}
 
-    config = parse_terraform_file(tf_file)
+resource "aws_instance" "large" {
+  instance_type = local.size_large
+}
+''')
 
-    assert len(config.lambda_functions) == 1
-    lambda_fn = config.lambda_functions[0]
-    assert lambda_fn.name == "test_lambda"
-    assert lambda_fn.attributes["function_name"] == "test-function"
-    assert lambda_fn.attributes["runtime"] == "python3.11"
+    assert [ec2.attributes["instance_type"] for ec2 in config.ec2_instances] == [
+        "t3.micro",
+        "t3.large",
+    ]
 
 
-def test_parse_cloudwatch_logs(tmp_path, sample_terraform_content):
-    """Test parsing CloudWatch log group resources."""
-    tf_file = tmp_path / "main.tf"
-    tf_file.write_text(sample_terraform_content)
+def test_locals_only_come_from_locals_block(sample_terraform_content):
+    """Test that assignments inside resource bodies are not recorded as locals."""
+    config = parse_terraform_string(
+        'locals {\n  env = "prod"\n}\n' + sample_terraform_content
+    )
 
-    config = parse_terraform_file(tf_file)
+    assert config.locals == {"env": "prod"}
 
-    assert len(config.cloudwatch_logs) == 1
-    cw = config.cloudwatch_logs[0]
-    assert cw.name == "test_logs"
-    assert cw.attributes["log_group_name"] == "/aws/lambda/test-function"
 
+def test_parse_directory_reuses_unchanged_files(
+    tmp_path, sample_terraform_content, monkeypatch
+):
+    """Test that unchanged files are not re-parsed and results are independent."""
+    (tmp_path / "main.tf").write_text(sample_terraform_content)
+    first = parse_directory(tmp_path)
 
-def test_parse_iam_role(tmp_path, sample_terraform_content):
-    """Test parsing IAM role resources."""
-    tf_file = tmp_path / "main.tf"
-    tf_file.write_text(sample_terraform_content)
+    def fail_read(*args, **kwargs):
+        raise AssertionError("unchanged file should not be re-read")
 
-    config = parse_terraform_file(tf_file)
+    monkeypatch.setattr(parser, "_read_terraform_file", fail_read)
+    second = parse_directory(tmp_path)
 
-    assert len(config.iam_roles) == 1
-    role = config.iam_roles[0]
-    assert role.name == "test_role"
-    assert role.attributes["role_name"] == "test-lambda-role"
+    assert second == first
+    assert second.ec2_instances[0] is not first.ec2_instances[0]
 
 
-def test_parse_route53(tmp_path, sample_terraform_content):
-    """Test parsing Route53 record resources."""
+def test_iter_terraform_file(tmp_path, sample_terraform_content):
+    """Test that streamed resources rebuild the same config as a full parse."""
     tf_file = tmp_path / "main.tf"
     tf_file.write_text(sample_terraform_content)
 
     config = parse_terraform_file(tf_file)
 
-    assert len(config.route53_records) == 1
-    r53 = config.route53_records[0]
-    assert r53.name == "test_dns"
-    assert r53.attributes["domain"] == "test.example.com"
-    assert r53.attributes["record_type"] == "A"
+    rebuilt = ParsedTerraformConfig(locals=config.locals)
+    for field_name, resource in iter_terraform_file(tf_file):
+        getattr(rebuilt, field_name).append(resource)
 
+    assert rebuilt == config
 
-def test_parse_missing_file():
-    """Test error handling for missing files."""
-    with pytest.raises(FileNotFoundError):
-        parse_terraform_file(Path("/nonexistent/file.tf"))
 
+def test_parse_terraform_file_reuses_unchanged_file(
+    tmp_path, sample_terraform_content, monkeypatch
+):
+    """Test that re-parsing an unchanged file is served from the parse memo."""
+    tf_file = tmp_path / "main.tf"
+    tf_file.write_text(sample_terraform_content)
+    first = parse_terraform_file(tf_file)
 
-def test_parse_directory(tmp_path, sample_terraform_content):
-    """Test parsing multiple Terraform files in a directory."""
-    # Create multiple .tf files
-    (tmp_path / "main.tf").write_text(sample_terraform_content)
-    (tmp_path / "alb.tf").write_text(
-        'resource "aws_lb" "another_alb" { name = "alb2" }'
-    )
+    def fail_read(*args, **kwargs):
+        raise AssertionError("unchanged file should not be re-read")
 
-    config = parse_directory(tmp_path)
+    monkeypatch.setattr(parser, "_read_terraform_file", fail_read)
+    second = parse_terraform_file(tf_file)
 
-    # Should have resources from both files
-    assert len(config.ec2_instances) == 1
-    assert len(config.albs) == 2  # One from main.tf, one from alb.tf
+    assert second == first
+    assert second is not first
 
 
-def test_parse_directory_no_tf_files(tmp_path):
-    """Test error handling when directory has no .tf files."""
-    with pytest.raises(ValueError, match="No .tf files found"):
-        parse_directory(tmp_path)
+def test_parse_terraform_string_returns_independent_copies(sample_terraform_content):
+    """Test that memoized string parses do not share mutable state."""
+    first = parse_terraform_string(sample_terraform_content)
+    first.ec2_instances[0].attributes["instance_type"] = "mutated"
 
+    second = parse_terraform_string(sample_terraform_content)
 
-def test_parse_directory_missing_directory():
-    """Test error handling for missing directory."""
-    with pytest.raises(FileNotFoundError):
-        parse_directory(Path("/nonexistent/directory"))
+    assert second.ec2_instances[0].attributes["instance_type"] == "t3.large"
 
 
-def test_get_all_resources(tmp_path, sample_terraform_content):
-    """Test getting all resources as a flat list."""
-    tf_file = tmp_path / "main.tf"
-    tf_file.write_text(sample_terraform_content)
+def test_parse_terraform_string_memo_is_keyed_on_digest(
+    sample_terraform_content, monkeypatch
+):
+    """Test that the content memo holds short digests rather than file text."""
+    monkeypatch.setattr(parser, "_PARSED_STRINGS", type(parser._PARSED_STRINGS)())
+    monkeypatch.setattr(parser, "_PARSED_STRINGS_MAX", 1)
 
-    config = parse_terraform_file(tf_file)
-    all_resources = config.get_all_resources()
+    parse_terraform_string(sample_terraform_content)
+    parse_terraform_string('resource "aws_lb" "other_alb" { name = "alb2" }')
 
-    # Should have all resource types
-    assert len(all_resources) == 7  # EC2, SG, ALB, Lambda, CW, IAM, Route53
\ No newline at end of file
+    assert len(parser._PARSED_STRINGS) == 1
+    assert all(len(key) == 16 for key in parser._PARSED_STRINGS)